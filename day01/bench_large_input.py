@@ -0,0 +1,86 @@
+"""
+Generate big day01 inputs and compare part 2 engines on throughput.
+Run from this directory:
+
+    python bench_large_input.py --size-mb 8
+    python bench_large_input.py --output large_input.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import part2
+import part2_automaton
+import part2_no_replace
+import part2_regex
+
+import support as sup
+
+ENGINES = {
+    "part2": part2.compute,
+    "part2_no_replace": part2_no_replace.compute,
+    "part2_automaton": part2_automaton.compute,
+    "part2_regex": part2_regex.compute,
+    "part2_regex lookahead": lambda s: part2_regex.compute(s, method="lookahead"),
+}
+NOISE = "abcdefghijklmnopqrstuvwxyz"
+NUMBERS = [*part2.SPELLED_NUMBERS, *"123456789"]
+
+
+def generate_line(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        parts.append("".join(rng.choices(NOISE, k=rng.randint(0, 8))))
+        parts.append(rng.choice(NUMBERS))
+    # overlapping words like "oneight" on both ends
+    if rng.random() < 0.2:
+        parts.insert(0, "oneigh")
+    if rng.random() < 0.2:
+        parts.append("twone")
+    return "".join(parts)
+
+
+def generate_input(size: int, seed: int = 0) -> str:
+    """Lines of noise and numbers, at least `size` bytes."""
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size:
+        line = generate_line(rng)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="only write generated input here")
+    args = parser.parse_args()
+
+    s = generate_input(int(args.size_mb * 1024 * 1024), args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(s)
+        return
+
+    megabytes = len(s) / 1024 / 1024
+    print(f"{megabytes:.1f} MB, {s.count(chr(10))} lines")
+    expected = None
+    for label, compute in ENGINES.items():
+        start = time.perf_counter()
+        result = compute(s)
+        spent = time.perf_counter() - start
+        if expected is None:
+            expected = result
+        assert result == expected, label
+        one_run = sup.humanized_seconds(spent)
+        print(f"  {label:<22} {one_run:>8}  {megabytes / spent:6.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
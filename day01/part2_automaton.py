@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+import pytest
+
+import support as sup
+
+INPUT_TXT = Path(__file__).parent / "input.txt"
+
+SPELLED_NUMBERS = [
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+]
+
+
+DIGITS = [str(i) for i in range(10)]
+VALUES = {
+    **{word: value for value, word in enumerate(SPELLED_NUMBERS, start=1)},
+    **{digit: int(digit) for digit in DIGITS},
+}
+AUTOMATON = sup.AhoCorasick([*SPELLED_NUMBERS, *DIGITS])
+
+
+def compute(s: str) -> int:
+    result = 0
+    start = 0
+    # lines are scanned in place, without splitting the input
+    while start < len(s):
+        end = s.find("\n", start)
+        if end == -1:
+            end = len(s)
+        left = AUTOMATON.first_match(s, start, end)
+        right = AUTOMATON.last_match(s, start, end)
+        if left is None or right is None:
+            raise ValueError("No number found")
+        result += VALUES[left[1]] * 10 + VALUES[right[1]]
+        start = end + 1
+    return result
+
+
+INPUT_S = """\
+two1nine
+eightwothree
+abcone2threexyz
+xtwone3four
+4nineeightseven2
+zoneight234
+7pqrstsixteen
+"""
+EXPECTED = 281
+
+
+@pytest.mark.parametrize(
+    ("input_s", "expected"),
+    (
+        (INPUT_S, EXPECTED),
+        ("sdonefour77one", 11),
+        ("ktnxrj2sixsevenrcnqbksgbgdfxrdqgz", 27),
+        ("ktnxrj2sixsevenrcn", 27),
+        ("1drjnqoneninennhqt", 19),
+        ("twofiveoneseven1rqjvrrxtwonen", 21),
+        ("two7fivenrgdqshs", 25),
+        ("7ninetphdpcx", 79),
+        ("a0b1c", 1),
+    ),
+)
+def test_debug(input_s: str, expected: int) -> None:
+    assert compute(input_s) == expected
+
+
+@pytest.mark.parametrize("input_s", ["abc", "1\nabc\n2", "1\n\n2\n"])
+def test_line_without_number(input_s: str) -> None:
+    with pytest.raises(ValueError, match="No number found"):
+        compute(input_s)
+
+
+def test_input() -> None:
+    result = compute(read_input())
+
+    assert result == 53868
+
+
+def read_input() -> str:
+    with open(INPUT_TXT) as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    input_data = read_input()
+    print("Answer is:     ", compute(input_data))
+
+    if "-b" in sys.argv:
+        number_of_runs = 1000
+        bench_time = timeit.timeit(
+            "compute(data)",
+            setup="from __main__ import compute",
+            globals={"data": input_data},
+            number=number_of_runs,
+        )
+        print(f"{number_of_runs} runs took: {bench_time}s")
+        one_run = sup.humanized_seconds(bench_time / number_of_runs)
+        print(f"Average time:   {one_run}")
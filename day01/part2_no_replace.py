@@ -77,7 +77,7 @@ def compute(s: str) -> int:
         right_number = -1
         left_graph_path = []
         right_graph_path = []
-        while left <= right:
+        while left < len(line) and right >= 0:
             if left_number >= 0 and right_number >= 0:
                 break
 
@@ -133,6 +133,8 @@ def compute(s: str) -> int:
                     continue
 
                 right -= 1
+        if left_number < 0 or right_number < 0:
+            raise ValueError("No number found")
         result += left_number * 10 + right_number
     return result
 
@@ -160,12 +162,21 @@ EXPECTED = 281
         ("twofiveoneseven1rqjvrrxtwonen", 21),
         ("two7fivenrgdqshs", 25),
         ("7ninetphdpcx", 79),
+        ("naxvqnine", 99),
+        ("zrcyykjdone", 11),
+        ("a0b1c", 1),
     ),
 )
 def test_debug(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
+@pytest.mark.parametrize("input_s", ["abc", "1\nabc\n2", "1\n\n2\n"])
+def test_line_without_number(input_s: str) -> None:
+    with pytest.raises(ValueError, match="No number found"):
+        compute(input_s)
+
+
 def test_input() -> None:
     result = compute(read_input())
 
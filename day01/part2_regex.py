@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+import pytest
+
+import support as sup
+
+INPUT_TXT = Path(__file__).parent / "input.txt"
+
+SPELLED_NUMBERS = [
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+]
+
+
+VALUES = {
+    **{word: value for value, word in enumerate(SPELLED_NUMBERS, start=1)},
+    **{str(value): value for value in range(10)},
+}
+# 0-9 as in other engines, \d would match non-ascii digits too
+NUMBER = "|".join([*SPELLED_NUMBERS, "[0-9]"])
+# whole input at once, "." doesn't match newline, so matches stay in lines:
+# lazy prefix stops at the first number, greedy one backtracks to the last
+FIRST_RE = re.compile(rf"^.*?({NUMBER})", re.MULTILINE)
+LAST_RE = re.compile(rf"^.*({NUMBER})", re.MULTILINE)
+# every number, overlapping ones too ("oneight"), and line ends
+ALL_RE = re.compile(rf"(?=({NUMBER}|\n))")
+
+
+def compute(s: str, *, method: str = "anchored") -> int:
+    if method == "anchored":
+        return compute_anchored(s)
+    if method == "lookahead":
+        return compute_lookahead(s)
+    raise ValueError(f"Unknown method {method!r}")
+
+
+def compute_anchored(s: str) -> int:
+    firsts = FIRST_RE.findall(s)
+    # lines without a number have no match
+    lines_num = s.count("\n") + (1 if s and s[-1] != "\n" else 0)
+    if len(firsts) != lines_num:
+        raise ValueError("No number found")
+    first = sum(VALUES[number] for number in firsts)
+    last = sum(VALUES[number] for number in LAST_RE.findall(s))
+    return first * 10 + last
+
+
+def compute_lookahead(s: str) -> int:
+    result = 0
+    first = last = None
+    if s and s[-1] != "\n":
+        s = f"{s}\n"
+    for match in ALL_RE.findall(s):
+        if match != "\n":
+            if first is None:
+                first = match
+            last = match
+        elif first is not None:
+            result += VALUES[first] * 10 + VALUES[last]
+            first = None
+        else:
+            raise ValueError("No number found")
+    return result
+
+
+INPUT_S = """\
+two1nine
+eightwothree
+abcone2threexyz
+xtwone3four
+4nineeightseven2
+zoneight234
+7pqrstsixteen
+"""
+EXPECTED = 281
+
+
+@pytest.mark.parametrize(
+    ("input_s", "expected"),
+    (
+        (INPUT_S, EXPECTED),
+        ("sdonefour77one", 11),
+        ("ktnxrj2sixsevenrcnqbksgbgdfxrdqgz", 27),
+        ("ktnxrj2sixsevenrcn", 27),
+        ("1drjnqoneninennhqt", 19),
+        ("twofiveoneseven1rqjvrrxtwonen", 21),
+        ("two7fivenrgdqshs", 25),
+        ("7ninetphdpcx", 79),
+        ("a0b1c", 1),
+    ),
+)
+@pytest.mark.parametrize("method", ["anchored", "lookahead"])
+def test_debug(input_s: str, expected: int, method: str) -> None:
+    assert compute(input_s, method=method) == expected
+
+
+@pytest.mark.parametrize("input_s", ["abc", "1\nabc\n2", "1\n\n2\n"])
+@pytest.mark.parametrize("method", ["anchored", "lookahead"])
+def test_line_without_number(input_s: str, method: str) -> None:
+    with pytest.raises(ValueError, match="No number found"):
+        compute(input_s, method=method)
+
+
+@pytest.mark.parametrize("method", ["anchored", "lookahead"])
+def test_input(method: str) -> None:
+    result = compute(read_input(), method=method)
+
+    assert result == 53868
+
+
+def read_input() -> str:
+    with open(INPUT_TXT) as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    input_data = read_input()
+    print("Answer is:     ", compute(input_data))
+
+    if "-b" in sys.argv:
+        number_of_runs = 1000
+        bench_time = timeit.timeit(
+            "compute(data)",
+            setup="from __main__ import compute",
+            globals={"data": input_data},
+            number=number_of_runs,
+        )
+        print(f"{number_of_runs} runs took: {bench_time}s")
+        one_run = sup.humanized_seconds(bench_time / number_of_runs)
+        print(f"Average time:   {one_run}")
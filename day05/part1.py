@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import sys
 import timeit
-from itertools import chain
+from functools import reduce
 from pathlib import Path
 
 import pytest
@@ -12,37 +12,34 @@ import support as sup
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
 
-def compute(s: str) -> int:
-    source_indexes = []
-    ranges = []
-    for line in chain(s.splitlines(), [""]):
-        if not line.strip():
-            if not ranges:
-                continue
-            for i, source_index in enumerate(source_indexes):
-                for source_range, destination_range in ranges:
-                    if source_index in source_range:
-                        mapped_index = destination_range.start + (
-                            source_index - source_range.start
-                        )
-                        source_indexes[i] = mapped_index
-                        break
-            ranges = []
-
-        elif ":" in line:
-            name, values = line.split(":")
-            if name == "seeds":
-                source_indexes = [int(x) for x in values.strip().split()]
-        else:
+def compute(s: str, *, composed: bool = True) -> int:
+    seeds, mapping_tables = parse_almanac(s)
+    maps = [sup.PiecewiseLinearMap(mapping_table) for mapping_table in mapping_tables]
+    if composed:
+        # seed-to-location in one map, every seed is one bisect
+        maps = [reduce(sup.PiecewiseLinearMap.compose, maps)]
+
+    indexes = seeds
+    for almanac_map in maps:
+        indexes = [almanac_map(index) for index in indexes]
+    return min(indexes)
+
+
+def parse_almanac(s: str) -> tuple[list[int], list[list[tuple[sup.Range, int]]]]:
+    seeds_s, *sections = s.strip().split("\n\n")
+    _, values = seeds_s.split(":")
+    seeds = [int(x) for x in values.split()]
+    mapping_tables = []
+    for section in sections:
+        _, *lines = section.splitlines()
+        mapping_table = []
+        for line in lines:
             destination, source, range_len = (int(i) for i in line.split())
-            ranges.append(
-                (
-                    sup.Range(source, source + range_len),
-                    sup.Range(destination, destination + range_len),
-                )
+            mapping_table.append(
+                (sup.Range(source, source + range_len), destination - source)
             )
-
-    return min(source_indexes)
+        mapping_tables.append(mapping_table)
+    return seeds, mapping_tables
 
 
 INPUT_S = """\
@@ -83,9 +80,10 @@ humidity-to-location map:
 EXPECTED = 35
 
 
+@pytest.mark.parametrize("composed", [True, False])
 @pytest.mark.parametrize("input_s,expected", [(INPUT_S, EXPECTED)])
-def test_debug(input_s: str, expected: int) -> None:
-    assert compute(input_s) == expected
+def test_debug(input_s: str, expected: int, composed: bool) -> None:
+    assert compute(input_s, composed=composed) == expected
 
 
 def test_input() -> None:
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import sys
 import timeit
-from itertools import chain, islice
+from functools import reduce
+from itertools import islice
 from pathlib import Path
 
 import pytest
@@ -23,41 +24,36 @@ def batched(iterable, n):
         yield batch
 
 
-def compute(s: str) -> int:
-    current_source_ranges = []
-    ranges = []
-    for line in chain(s.splitlines(), [""]):
-        if not line.strip():
-            if not ranges:
-                continue
-            for i, curr_source_range in enumerate(current_source_ranges):
-                for source_range, dest_range in ranges:
-                    if intersect := curr_source_range.intersection(source_range):
-                        current_source_ranges[i] = sup.Range(
-                            dest_range.start + (intersect.start - source_range.start),
-                            dest_range.end + (intersect.end - source_range.end),
-                        )
-                        if remainder := curr_source_range.remainder(source_range):
-                            current_source_ranges.extend(remainder)
-                        break
-            ranges = []
-
-        elif ":" in line:
-            name, values = line.split(":")
-            if name == "seeds":
-                seeds_input = [int(x) for x in values.strip().split()]
-                for start, range_len in batched(seeds_input, 2):
-                    current_source_ranges.append(sup.Range(start, start + range_len))
-        else:
+def compute(s: str, *, composed: bool = True) -> int:
+    seeds, mapping_tables = parse_almanac(s)
+    maps = [sup.PiecewiseLinearMap(mapping_table) for mapping_table in mapping_tables]
+    if composed:
+        # only breakpoints of seed-to-location map inside seed ranges are used
+        maps = [reduce(sup.PiecewiseLinearMap.compose, maps)]
+
+    current_ranges = sup.RangeSet(
+        sup.Range(start, start + range_len) for start, range_len in batched(seeds, 2)
+    )
+    for almanac_map in maps:
+        current_ranges = almanac_map.map_ranges(current_ranges)
+    return current_ranges.starts[0]
+
+
+def parse_almanac(s: str) -> tuple[list[int], list[list[tuple[sup.Range, int]]]]:
+    seeds_s, *sections = s.strip().split("\n\n")
+    _, values = seeds_s.split(":")
+    seeds = [int(x) for x in values.split()]
+    mapping_tables = []
+    for section in sections:
+        _, *lines = section.splitlines()
+        mapping_table = []
+        for line in lines:
             destination, source, range_len = (int(i) for i in line.split())
-            ranges.append(
-                (
-                    sup.Range(source, source + range_len),
-                    sup.Range(destination, destination + range_len),
-                )
+            mapping_table.append(
+                (sup.Range(source, source + range_len), destination - source)
             )
-
-    return min(s.start for s in current_source_ranges)
+        mapping_tables.append(mapping_table)
+    return seeds, mapping_tables
 
 
 INPUT_S = """\
@@ -98,9 +94,10 @@ humidity-to-location map:
 EXPECTED = 46
 
 
+@pytest.mark.parametrize("composed", [True, False])
 @pytest.mark.parametrize("input_s,expected", [(INPUT_S, EXPECTED)])
-def test_debug(input_s: str, expected: int) -> None:
-    assert compute(input_s) == expected
+def test_debug(input_s: str, expected: int, composed: bool) -> None:
+    assert compute(input_s, composed=composed) == expected
 
 
 def test_input() -> None:
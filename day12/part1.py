@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import sys
 import timeit
-from itertools import product
+from itertools import accumulate, product
 from pathlib import Path
 
 import pytest
@@ -18,31 +18,66 @@ def validate_combination(combination: str, group_sizes: list[int]) -> bool:
     return groups == group_sizes
 
 
-def compute(s: str) -> int:
+def compute(s: str, *, brute_force: bool = False) -> int:
+    count_func = count_brute_force if brute_force else count_arrangements
     total_count = 0
     for line in s.splitlines():
         spring_states, group_sizes = line.split(" ")
-        group_sizes = list(map(int, group_sizes.split(",")))
+        total_count += count_func(spring_states, list(map(int, group_sizes.split(","))))
 
-        unknown_count = spring_states.count("?")
-        possible_combinations = product(".#", repeat=unknown_count)
-
-        valid_combinations = 0
-        for combination in possible_combinations:
-            combination_index = 0
-            temp_spring_states = list(spring_states)
-
-            for i, state in enumerate(temp_spring_states):
-                if state == "?":
-                    temp_spring_states[i] = combination[combination_index]
-                    combination_index += 1
-
-            if validate_combination("".join(temp_spring_states), group_sizes):
-                valid_combinations += 1
+    return total_count
 
-        total_count += valid_combinations
 
-    return total_count
+def count_brute_force(spring_states: str, group_sizes: list[int]) -> int:
+    unknown_count = spring_states.count("?")
+    possible_combinations = product(".#", repeat=unknown_count)
+
+    valid_combinations = 0
+    for combination in possible_combinations:
+        combination_index = 0
+        temp_spring_states = list(spring_states)
+
+        for i, state in enumerate(temp_spring_states):
+            if state == "?":
+                temp_spring_states[i] = combination[combination_index]
+                combination_index += 1
+
+        if validate_combination("".join(temp_spring_states), group_sizes):
+            valid_combinations += 1
+
+    return valid_combinations
+
+
+def count_arrangements(pattern: str, group_sizes: list[int]) -> int:
+    """
+    DP over (position, group): ways[i] is number of ways to place groups
+    from the current one on in pattern[i:]. Groups are added from the
+    last one, so only two rows live at once and nothing outlives the line.
+    """
+    n = len(pattern)
+    # number of "#" and "." in pattern[:i]
+    broken = [0, *accumulate(c == "#" for c in pattern)]
+    operational = [0, *accumulate(c == "." for c in pattern)]
+
+    # no groups left, so there must be no "#" left
+    ways = [int(broken[i] == broken[n]) for i in range(n + 1)]
+    first_starts = [0, *accumulate(size + 1 for size in group_sizes)]
+    needed = 0
+    for j in reversed(range(len(group_sizes))):
+        size = group_sizes[j]
+        next_ways = ways
+        ways = [0] * (n + 1)
+        for i in range(n - needed - size, first_starts[j] - 1, -1):
+            # "." (or "?" as ".") here, group starts later
+            total = ways[i + 1] if pattern[i] != "#" else 0
+            end = i + size
+            # block of size "#" can start here and is followed by "." or the end
+            if operational[end] == operational[i] and (end == n or pattern[end] != "#"):
+                total += next_ways[min(end + 1, n)]
+            ways[i] = total
+        needed += size + 1
+
+    return ways[0]
 
 
 INPUT_S = """\
@@ -68,6 +103,17 @@ def test_debug(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
+def test_count_matches_brute_force() -> None:
+    lines = [*INPUT_S.splitlines(), *read_input().splitlines()[:10]]
+    for line in lines:
+        spring_states, group_sizes = line.split(" ")
+        sizes = list(map(int, group_sizes.split(",")))
+
+        result = count_arrangements(spring_states, sizes)
+
+        assert result == count_brute_force(spring_states, sizes)
+
+
 def test_input() -> None:
     result = compute(read_input())
 
@@ -84,7 +130,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 3
+        number_of_runs = 100
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import re
 import sys
 import timeit
-from functools import cache
-from itertools import chain, repeat
+from itertools import accumulate, repeat
 from pathlib import Path
+from typing import Iterable
 
 import pytest
 
@@ -13,54 +12,88 @@ import support as sup
 
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
-CLEAN_RE = re.compile(r"\.+")
 
+def compute(s: str, *, unfold: int = 5, method: str = "dp") -> int:
+    return sum_arrangements(s.splitlines(), unfold=unfold, method=method)
 
-# I had to look up the solution to this problem 🫣
-def compute(s: str) -> int:
+
+def sum_arrangements(
+    lines: Iterable[str], *, unfold: int = 5, method: str = "dp"
+) -> int:
+    """
+    Lines are processed one by one, so an opened file streams through.
+    Every pattern is repeated `unfold` times joined by "?".
+    """
+    count_func = COUNT_METHODS[method]
     result = 0
-    for line in s.splitlines():
+    for line in lines:
+        if not (line := line.strip()):
+            continue
         spring_states, group_sizes = line.split(" ")
-        spring_states = "?".join(spring_states for _ in range(5))
-        spring_states = clean_pattern(spring_states)
-        group_sizes = ",".join(group_sizes for _ in range(5))
-        group_sizes = tuple(map(int, group_sizes.split(",")))
-        temp_res = calc_combinations(spring_states, group_sizes)
-        result += temp_res
+        spring_states = "?".join(repeat(spring_states, unfold))
+        sizes = list(map(int, group_sizes.split(","))) * unfold
+        result += count_func(spring_states, sizes)
 
     return result
 
 
-def clean_pattern(pattern: str) -> str:
-    one_dot = CLEAN_RE.sub(".", pattern)
-    return f"{one_dot.strip('.')}."
-
-
-@cache
-def calc_combinations(pattern: str, pieces: tuple[int, ...]) -> int:
-    if not pieces:
-        return 0 if "#" in pattern else 1
-
-    first = pieces[0]
-    rest = tuple(pieces[1:])
-    total = 0
-    min_pattern_size = sum(pieces) + len(pieces)
-    for i in range(len(pattern) - min_pattern_size + 1):
-        if valid_piece(pattern, i, first):
-            next_pattern_start = i + first + 1
-            total += calc_combinations(pattern[next_pattern_start:], rest)
-        if pattern[i] == "#":
-            break
-    return total
-
-
-def valid_piece(pattern: str, i: int, size: int) -> bool:
-    for pat_c, size_c in zip(pattern[i:], chain(repeat("#", size), ".")):
-        if pat_c == "?":
-            continue
-        if pat_c != size_c:
-            return False
-    return True
+def count_arrangements(pattern: str, group_sizes: list[int]) -> int:
+    """
+    DP over (position, group): ways[i] is number of ways to place groups
+    from the current one on in pattern[i:]. Groups are added from the
+    last one, so only two rows live at once and nothing outlives the line.
+    """
+    n = len(pattern)
+    # number of "#" and "." in pattern[:i]
+    broken = [0, *accumulate(c == "#" for c in pattern)]
+    operational = [0, *accumulate(c == "." for c in pattern)]
+
+    # no groups left, so there must be no "#" left
+    ways = [int(broken[i] == broken[n]) for i in range(n + 1)]
+    first_starts = [0, *accumulate(size + 1 for size in group_sizes)]
+    needed = 0
+    for j in reversed(range(len(group_sizes))):
+        size = group_sizes[j]
+        next_ways = ways
+        ways = [0] * (n + 1)
+        for i in range(n - needed - size, first_starts[j] - 1, -1):
+            # "." (or "?" as ".") here, group starts later
+            total = ways[i + 1] if pattern[i] != "#" else 0
+            end = i + size
+            # block of size "#" can start here and is followed by "." or the end
+            if operational[end] == operational[i] and (end == n or pattern[end] != "#"):
+                total += next_ways[min(end + 1, n)]
+            ways[i] = total
+        needed += size + 1
+
+    return ways[0]
+
+
+def count_arrangements_nfa(pattern: str, group_sizes: list[int]) -> int:
+    """
+    Run pattern through NFA of all valid rows: ".*#{g1}.+#{g2}.+ ... .*".
+    States are positions in that template, at most one state per cell
+    of the template is active, so cost is len(pattern) * len(template).
+    """
+    template = "." + ".".join("#" * size for size in group_sizes) + "."
+    last = len(template) - 1
+    states = {0: 1}
+    for c in pattern:
+        next_states: dict[int, int] = {}
+        for state, count in states.items():
+            if c != "#":
+                if template[state] == ".":
+                    next_states[state] = next_states.get(state, 0) + count
+                if state < last and template[state + 1] == ".":
+                    next_states[state + 1] = next_states.get(state + 1, 0) + count
+            if c != "." and state < last and template[state + 1] == "#":
+                next_states[state + 1] = next_states.get(state + 1, 0) + count
+        states = next_states
+
+    return states.get(last, 0) + states.get(last - 1, 0)
+
+
+COUNT_METHODS = {"dp": count_arrangements, "nfa": count_arrangements_nfa}
 
 
 INPUT_S = """\
@@ -79,6 +112,20 @@ def test_debug(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
+@pytest.mark.parametrize("unfold", [1, 2, 5, 10])
+def test_methods_agree(unfold: int) -> None:
+    dp = compute(INPUT_S, unfold=unfold)
+
+    assert compute(INPUT_S, unfold=unfold, method="nfa") == dp
+
+
+def test_sum_arrangements_from_file() -> None:
+    with open(INPUT_TXT) as f:
+        result = sum_arrangements(f, unfold=5)
+
+    assert result == compute(read_input())
+
+
 def test_input() -> None:
     result = compute(read_input())
 
@@ -95,7 +142,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 100
+        number_of_runs = 20
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
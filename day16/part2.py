@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 import sys
 import timeit
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
@@ -13,32 +16,188 @@ INPUT_TXT = Path(__file__).parent / "input.txt"
 Coords = tuple[int, int]
 Move = tuple[int, int, str]
 
+UP, RIGHT, DOWN, LEFT = range(4)
+DIRECTIONS = {"up": UP, "right": RIGHT, "down": DOWN, "left": LEFT}
+# directions beam leaves a cell with, indexed by the direction it came with
+TRANSITIONS = {
+    ".": ((UP,), (RIGHT,), (DOWN,), (LEFT,)),
+    "/": ((RIGHT,), (UP,), (LEFT,), (DOWN,)),
+    "\\": ((LEFT,), (DOWN,), (RIGHT,), (UP,)),
+    "|": ((UP,), (UP, DOWN), (DOWN,), (UP, DOWN)),
+    "-": ((LEFT, RIGHT), (RIGHT,), (LEFT, RIGHT), (LEFT,)),
+}
+TRANSITIONS_TABLE = tuple(TRANSITIONS.get(chr(i)) for i in range(256))
 
-def compute(s: str) -> int:
-    matrix, _, _ = sup.make_matrix_from_input(s)
-    next_coords = sup.max_bounds_closure(sup.next_coords, matrix)
 
-    max_seen = 0
-    for move in get_first_moves(matrix):
-        stack = [move]
-        seen_cells = set()
-        seen_mirrors = set()
+def compute(s: str, *, workers: int = 0) -> int:
+    """
+    Best entry point energizes the most cells. With `workers` > 0
+    entry points are split between that many processes.
+    """
+    grid = sup.Grid.from_input(s)
+    starts = [
+        (grid.index(m, n), DIRECTIONS[direction])
+        for m, n, direction in get_first_moves(grid)
+    ]
+    if workers > 0:
+        return compute_parallel(s, starts, workers)
 
-        while stack:
-            m, n, direction = stack.pop()
-            if matrix[m][n] != ".":
-                mirror = (m, n, direction)
-                if mirror in seen_mirrors:
+    beams = BeamGraph(grid)
+    return max_energized(beams, starts)
+
+
+def max_energized(beams: BeamGraph, starts: list[tuple[int, int]]) -> int:
+    return max(beams.energized(cell, direction) for cell, direction in starts)
+
+
+def compute_parallel(s: str, starts: list[tuple[int, int]], workers: int) -> int:
+    chunks_num = workers * 4
+    chunks = [chunk for i in range(chunks_num) if (chunk := starts[i::chunks_num])]
+    # input is sent once per worker, tasks carry only entry points
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(s,)
+    ) as executor:
+        return max(executor.map(_worker_max_energized, chunks))
+
+
+_worker_beams: BeamGraph | None = None
+
+
+def _init_worker(s: str) -> None:
+    global _worker_beams
+    _worker_beams = BeamGraph(sup.Grid.from_input(s))
+
+
+def _worker_max_energized(starts: list[tuple[int, int]]) -> int:
+    assert _worker_beams is not None
+    return max_energized(_worker_beams, starts)
+
+
+class BeamGraph:
+    """
+    Graph of beams between cells which turn or split them.
+
+    Node `cell * 4 + direction` is a beam leaving mirror or splitter cell
+    in that direction, it lights a straight segment of cells up to the next
+    mirror or splitter, which is kept as a bitmask over flat grid indexes.
+    Beams loop, so cells lit from a node are collected per strongly
+    connected component (Tarjan) and shared by all entry points.
+    """
+
+    def __init__(self, grid: sup.Grid) -> None:
+        stride = grid.stride
+        self._cells = [TRANSITIONS_TABLE[b] for b in grid.data]
+        self._deltas = (-stride, 1, stride, -1)
+        # masks of first k cells of a row or a column
+        self._row_ones = [(1 << k) - 1 for k in range(grid.width + 1)]
+        self._column_ones = [0]
+        for k in range(grid.height):
+            self._column_ones.append(self._column_ones[-1] | 1 << (k * stride))
+        self._edges: dict[int, tuple[int, tuple[int, ...]]] = {}
+        self._lit: dict[int, int] = {}
+
+    def energized(self, cell: int, direction: int) -> int:
+        """Number of cells lit by beam entering `cell` in `direction`."""
+        mask, stop = self._segment(cell, direction)
+        if stop is not None:
+            for next_direction in self._cells[stop][direction]:
+                mask |= self._lit_from(stop * 4 + next_direction)
+        return mask.bit_count()
+
+    def _segment(self, cell: int, direction: int) -> tuple[int, int | None]:
+        """Mask of cells beam goes through and the cell where it turns."""
+        cells = self._cells
+        delta = self._deltas[direction]
+        size = len(cells)
+        i = cell
+        while 0 <= i < size and (transitions := cells[i]) is not None:
+            if transitions[direction] != (direction,):
+                stop = i
+                break
+            i += delta
+        else:
+            stop = None
+            i -= delta
+
+        count = (i - cell) // delta + 1
+        if count <= 0:
+            return 0, stop
+        ones = self._row_ones if direction in (LEFT, RIGHT) else self._column_ones
+        return ones[count] << min(cell, i), stop
+
+    def _node_edges(self, node: int) -> tuple[int, tuple[int, ...]]:
+        if (edges := self._edges.get(node)) is None:
+            cell, direction = divmod(node, 4)
+            mask, stop = self._segment(cell + self._deltas[direction], direction)
+            if stop is None:
+                next_nodes = ()
+            else:
+                next_nodes = tuple(
+                    stop * 4 + next_direction
+                    for next_direction in self._cells[stop][direction]
+                )
+            edges = self._edges[node] = (mask, next_nodes)
+        return edges
+
+    def _lit_from(self, root: int) -> int:
+        lit = self._lit
+        if root in lit:
+            return lit[root]
+
+        index: dict[int, int] = {}
+        low: dict[int, int] = {}
+        stack: list[int] = []
+        on_stack: set[int] = set()
+
+        def visit(node: int) -> None:
+            index[node] = low[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            work.append((node, iter(self._node_edges(node)[1])))
+
+        work: list[tuple[int, Iterator[int]]] = []
+        visit(root)
+        while work:
+            node, next_nodes = work[-1]
+            for next_node in next_nodes:
+                if next_node in lit:
                     continue
-                seen_mirrors.add(mirror)
-            seen_cells.add((m, n))
-            next_moves = get_next_moves(matrix, next_coords, m, n, direction)
-            stack.extend(next_moves)
+                if next_node not in index:
+                    visit(next_node)
+                    break
+                if next_node in on_stack:
+                    low[node] = min(low[node], index[next_node])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    self._add_component(stack, on_stack, node)
 
-        if (len_cells := len(seen_cells)) > max_seen:
-            max_seen = len_cells
+        return lit[root]
 
-    return max_seen
+    def _add_component(self, stack: list[int], on_stack: set[int], root: int) -> None:
+        component = []
+        while True:
+            node = stack.pop()
+            on_stack.discard(node)
+            component.append(node)
+            if node == root:
+                break
+
+        # components are finished in reverse topological order,
+        # so everything reachable outside of this one is known already
+        lit = self._lit
+        mask = 0
+        for node in component:
+            node_mask, next_nodes = self._edges[node]
+            mask |= node_mask
+            for next_node in next_nodes:
+                if next_node in lit:
+                    mask |= lit[next_node]
+        for node in component:
+            lit[node] = mask
 
 
 def get_first_moves(matrix) -> list[Move]:
@@ -66,30 +225,20 @@ def get_first_moves(matrix) -> list[Move]:
     return moves
 
 
-def get_next_moves(matrix, next_coords, m: int, n: int, direction: str) -> list[Move]:
-    new_directions = []
-    current_value = matrix[m][n]
-    if (direction, current_value) in [("up", "\\"), ("down", "/")]:
-        new_directions.append("left")
-    elif (direction, current_value) in [("up", "/"), ("down", "\\")]:
-        new_directions.append("right")
-    elif (direction, current_value) in [("left", "\\"), ("right", "/")]:
-        new_directions.append("up")
-    elif (direction, current_value) in [("left", "/"), ("right", "\\")]:
-        new_directions.append("down")
-    elif direction in ["left", "right"] and current_value == "|":
-        new_directions.extend(["up", "down"])
-    elif direction in ["up", "down"] and current_value == "-":
-        new_directions.extend(["left", "right"])
-    else:
-        new_directions.append(direction)
-
-    result = []
-    for direction in new_directions:
-        if coords := next_coords(m, n, direction):
-            result.append((*coords, direction))
-
-    return result
+def simulate(grid: sup.Grid, cell: int, direction: int) -> int:
+    deltas = (-grid.stride, 1, grid.stride, -1)
+    seen = {(cell, direction)}
+    stack = [(cell, direction)]
+    while stack:
+        cell, direction = stack.pop()
+        for next_direction in TRANSITIONS_TABLE[grid.data[cell]][direction]:
+            next_cell = cell + deltas[next_direction]
+            if not 0 <= next_cell < len(grid.data) or grid.data[next_cell] == 10:
+                continue
+            if (next_cell, next_direction) not in seen:
+                seen.add((next_cell, next_direction))
+                stack.append((next_cell, next_direction))
+    return len({cell for cell, _ in seen})
 
 
 INPUT_S = r""".|...\....
@@ -111,6 +260,19 @@ def test_debug(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
+def test_energized_matches_simulation() -> None:
+    grid = sup.Grid.from_input(INPUT_S)
+    beams = BeamGraph(grid)
+
+    for m, n, direction in get_first_moves(grid):
+        cell, direction_i = grid.index(m, n), DIRECTIONS[direction]
+        assert beams.energized(cell, direction_i) == simulate(grid, cell, direction_i)
+
+
+def test_compute_parallel() -> None:
+    assert compute(INPUT_S, workers=2) == EXPECTED
+
+
 def test_input() -> None:
     result = compute(read_input())
 
@@ -127,7 +289,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 3
+        number_of_runs = 100
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
@@ -137,3 +299,18 @@ if __name__ == "__main__":
         print(f"{number_of_runs} runs took: {bench_time}s")
         one_run = sup.humanized_seconds(bench_time / number_of_runs)
         print(f"Average time:   {one_run}")
+
+        # labelled differently so the Makefile benchmark keeps the serial row
+        workers = os.cpu_count() or 1
+        parallel_runs = 10
+        parallel_time = timeit.timeit(
+            "compute(data, workers=workers)",
+            setup="from __main__ import compute",
+            globals={"data": input_data, "workers": workers},
+            number=parallel_runs,
+        )
+        print(f"{workers} workers, {parallel_runs} runs took: {parallel_time}s")
+        parallel_one_run = sup.humanized_seconds(parallel_time / parallel_runs)
+        print(f"Pool average:   {parallel_one_run}")
+        speedup = (bench_time / number_of_runs) / (parallel_time / parallel_runs)
+        print(f"Pool speedup:   {speedup:.2f}x")
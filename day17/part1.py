@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import sys
 import timeit
-from itertools import product
 from pathlib import Path
 
 import pytest
@@ -23,45 +22,37 @@ OPPOSITE_DIRECTIONS_MAP = {
 
 def compute(s: str) -> int:
     matrix, len_m, len_n = sup.make_matrix_from_input(s, cast_func=int)
-    graph = create_graph(matrix)
-    dist, _ = sup.dijkstra(graph, ((0, 0), "right", 1))
-    return min(v for k, v in dist.items() if k[0] == (len_m - 1, len_n - 1))
+    target = (len_m - 1, len_n - 1)
+    dist, _ = sup.dial_shortest_path(
+        make_neighbors(matrix),
+        ((0, 0), "right", 1),
+        max_weight=9,
+        is_target=lambda state: state[0] == target,
+    )
+    return min(v for k, v in dist.items() if k[0] == target)
 
 
-def create_graph(matrix):
-    graph = {}
+def make_neighbors(matrix):
     next_coords = sup.max_bounds_closure(sup.next_coords, matrix)
-    num_of_next_coords = sup.max_bounds_closure(sup.num_of_next_coords, matrix)
     max_blocks = 3
-    for start_m, start_n, start_steps_num, start_direction in product(
-        range(len(matrix)), range(len(matrix[0])), range(1, max_blocks + 1), DIRECTIONS
-    ):
-        start_coords = (start_m, start_n)
-        if start_steps_num > 1:
-            opposite_direction = OPPOSITE_DIRECTIONS_MAP[start_direction]
-            prev_coords_count = num_of_next_coords(start_m, start_n, opposite_direction)
-            need_prev_coords = start_steps_num - 1
-            # don't have enough prev coords
-            if need_prev_coords > prev_coords_count:
-                continue
 
-        start_key = (start_coords, start_direction, start_steps_num)
+    def neighbors(state):
+        (start_m, start_n), start_direction, start_steps_num = state
         for dest_direction in DIRECTIONS:
-            if dest_coords := next_coords(start_m, start_n, dest_direction):
-                if dest_direction == OPPOSITE_DIRECTIONS_MAP[start_direction]:
-                    continue
-                dest_m, dest_n = dest_coords
-                dest_steps_num = start_steps_num
-                if start_direction == dest_direction:
-                    dest_steps_num += 1
-                else:
-                    dest_steps_num = 1
+            if dest_direction == OPPOSITE_DIRECTIONS_MAP[start_direction]:
+                continue
+            if start_direction == dest_direction:
+                dest_steps_num = start_steps_num + 1
                 if dest_steps_num > max_blocks:
                     continue
+            else:
+                dest_steps_num = 1
+            if dest_coords := next_coords(start_m, start_n, dest_direction):
+                dest_m, dest_n = dest_coords
                 dest_key = (dest_coords, dest_direction, dest_steps_num)
-                value = matrix[dest_m][dest_n]
-                graph.setdefault(start_key, {})[dest_key] = value
-    return graph
+                yield dest_key, matrix[dest_m][dest_n]
+
+    return neighbors
 
 
 INPUT_S = """\
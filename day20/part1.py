@@ -1,150 +1,212 @@
 from __future__ import annotations
 
-import math
 import sys
 import timeit
-from collections import deque
-from dataclasses import dataclass
-from enum import Enum
 from pathlib import Path
 
 import pytest
-from distlib.util import cached_property
 
 import support as sup
 
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
 
-class Pulse(Enum):
-    LOW = "low"
-    HIGH = "high"
-
-
-def log(command: Command) -> None:
-    print(f"{command.from_} -{command.pulse.value}-> {command.to}")
-
-
-@dataclass(frozen=True)
-class Command:
-    from_: str
-    to: str
-    pulse: Pulse
-
-
-class Module:
-    def __init__(self, name: str):
-        self.name = name
-        self.inputs: list[str] = []
-        self.receivers: list[str] = []
-
-    def __repr__(self) -> str:
-        return f"{type(self).__name__}({self.name!r})"
-
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        raise NotImplementedError
-
-    def _create_commands(self, pulse: Pulse) -> list[Command]:
-        return [
-            Command(from_=self.name, to=receiver, pulse=pulse)
-            for receiver in self.receivers
+BUTTON, BROADCASTER, FLIP_FLOP, CONJUNCTION, OUTPUT = range(5)
+LOW, HIGH = 0, 1
+PULSE_NAMES = ("low", "high")
+
+
+class Network:
+    """
+    Modules compiled to ints.
+
+    Every wire sender -> receiver is an edge id, a pulse is packed into
+    `edge << 1 | high`. Flip-flop memory is 0 or 1, conjunction memory
+    is a bitmask with a bit per input wire, so a conjunction sends low
+    when its memory equals `full` mask.
+    """
+
+    __slots__ = (
+        "names",
+        "ids",
+        "kinds",
+        "inputs",
+        "memory",
+        "_edge_receivers",
+        "_edge_bits",
+        "_full",
+        "_pulses",
+        "_button_pulse",
+        "_state_shifts",
+    )
+
+    def __init__(
+        self, names: list[str], kinds: list[int], receivers: list[list[int]]
+    ) -> None:
+        self.names = names
+        self.ids = {name: module_id for module_id, name in enumerate(names)}
+        self.kinds = kinds
+        self.inputs: list[list[int]] = [[] for _ in names]
+        self._edge_receivers: list[int] = []
+        self._edge_bits: list[int] = []
+        edges: list[list[int]] = [[] for _ in names]
+        for sender, module_receivers in enumerate(receivers):
+            for receiver in module_receivers:
+                edges[sender].append(len(self._edge_receivers))
+                self._edge_receivers.append(receiver)
+                self._edge_bits.append(1 << len(self.inputs[receiver]))
+                self.inputs[receiver].append(sender)
+
+        self._full = [(1 << len(module_inputs)) - 1 for module_inputs in self.inputs]
+        # pulses module sends, indexed by module id and then by level
+        self._pulses = [
+            (
+                tuple(edge << 1 | LOW for edge in module_edges),
+                tuple(edge << 1 | HIGH for edge in module_edges),
+            )
+            for module_edges in edges
         ]
+        self._button_pulse = edges[self.ids["button"]][0] << 1 | LOW
+        # where memory of every module goes in a snapshot
+        self._state_shifts = []
+        shift = 0
+        for module_id, kind in enumerate(kinds):
+            if kind == FLIP_FLOP:
+                self._state_shifts.append((module_id, shift))
+                shift += 1
+            elif kind == CONJUNCTION:
+                self._state_shifts.append((module_id, shift))
+                shift += len(self.inputs[module_id])
+        self.memory = [0] * len(names)
+
+    @classmethod
+    def from_input(cls, s: str) -> Network:
+        kinds = {"button": BUTTON}
+        receivers = {"button": ["broadcaster"]}
+        for line in s.splitlines():
+            name, module_receivers = line.split(" -> ")
+            if name[0] == "%":
+                name, kind = name[1:], FLIP_FLOP
+            elif name[0] == "&":
+                name, kind = name[1:], CONJUNCTION
+            else:
+                kind = BROADCASTER
+            kinds[name] = kind
+            receivers[name] = module_receivers.split(", ")
+        for module_receivers in list(receivers.values()):
+            for receiver in module_receivers:
+                kinds.setdefault(receiver, OUTPUT)
+
+        names = list(kinds)
+        ids = {name: module_id for module_id, name in enumerate(names)}
+        return cls(
+            names,
+            [kinds[name] for name in names],
+            [[ids[receiver] for receiver in receivers.get(name, [])] for name in names],
+        )
 
+    def reset(self) -> None:
+        self.memory = [0] * len(self.names)
+
+    def snapshot(self) -> int:
+        """State of all flip-flops and conjunctions packed in one int."""
+        memory = self.memory
+        state = 0
+        for module_id, shift in self._state_shifts:
+            state |= memory[module_id] << shift
+        return state
+
+    def press(self) -> list[int]:
+        """Push the button once, returns all packed pulses in order."""
+        memory = self.memory
+        kinds = self.kinds
+        edge_receivers = self._edge_receivers
+        edge_bits = self._edge_bits
+        full = self._full
+        pulses = self._pulses
+
+        queue = [self._button_pulse]
+        # list iterator sees items appended during the loop, so it's a queue
+        for pulse in queue:
+            edge = pulse >> 1
+            module = edge_receivers[edge]
+            kind = kinds[module]
+            if kind == FLIP_FLOP:
+                if pulse & 1:
+                    continue
+                level = memory[module] = memory[module] ^ 1
+            elif kind == CONJUNCTION:
+                if pulse & 1:
+                    state = memory[module] = memory[module] | edge_bits[edge]
+                else:
+                    state = memory[module] = memory[module] & ~edge_bits[edge]
+                level = state != full[module]
+            elif kind == BROADCASTER:
+                level = pulse & 1
+            else:
+                continue
+            queue += pulses[module][level]
+        return queue
+
+    def edge(self, sender: str, receiver: str) -> int:
+        sender_id, receiver_id = self.ids[sender], self.ids[receiver]
+        low_pulses, _ = self._pulses[sender_id]
+        for pulse in low_pulses:
+            if self._edge_receivers[pulse >> 1] == receiver_id:
+                return pulse >> 1
+        raise ValueError(f"No wire {sender} -> {receiver}")
+
+    def describe(self, pulse: int) -> str:
+        edge = pulse >> 1
+        receiver = self._edge_receivers[edge]
+        sender = self.inputs[receiver][self._edge_bits[edge].bit_length() - 1]
+        return (
+            f"{self.names[sender]} -{PULSE_NAMES[pulse & 1]}-> {self.names[receiver]}"
+        )
 
-class FlipFlop(Module):
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
-        self._is_on = False
-
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        if pulse == Pulse.HIGH:
-            return []
-        self._is_on = not self._is_on
-        return self._create_commands(Pulse.HIGH if self._is_on else Pulse.LOW)
-
-
-class Conjunction(Module):
-    @cached_property
-    def _memory(self):
-        return [False for _ in self.inputs]
-
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        index = self.inputs.index(sender)
-        self._memory[index] = pulse == Pulse.HIGH
-        return self._create_commands(Pulse.LOW if all(self._memory) else Pulse.HIGH)
 
+def compute(s: str) -> int:
+    low, high = count_pulses(Network.from_input(s), 1000)
+    return low * high
 
-class Broadcaster(Module):
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        return self._create_commands(pulse)
 
+def count_pulses(network: Network, presses: int) -> tuple[int, int]:
+    """
+    Low and high pulses sent in `presses` presses. Network state is
+    snapshotted after every press, once it repeats the rest is
+    extrapolated from the loop, so `presses` can be huge.
+    """
+    histograms = []
+    seen = {network.snapshot(): 0}
+    for press in range(1, presses + 1):
+        histograms.append(pulse_histogram(network.press()))
+        state = network.snapshot()
+        if state in seen:
+            break
+        seen[state] = press
+    else:
+        return sum_histograms(histograms)
 
-class Debug(Module):
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        return []
+    loop_start = seen[state]
+    loop = histograms[loop_start:]
+    loops, rest = divmod(presses - loop_start, len(loop))
+    low, high = sum_histograms(histograms[:loop_start])
+    loop_low, loop_high = sum_histograms(loop)
+    rest_low, rest_high = sum_histograms(loop[:rest])
+    return low + loops * loop_low + rest_low, high + loops * loop_high + rest_high
 
 
-class Button:
-    def __init__(self, broadcaster: Broadcaster) -> None:
-        self.name = "button"
-        self._broadcaster = broadcaster
+def press_histograms(network: Network, presses: int) -> list[tuple[int, int]]:
+    return [pulse_histogram(network.press()) for _ in range(presses)]
 
-    def press(self) -> Command:
-        return Command(from_=self.name, to=self._broadcaster.name, pulse=Pulse.LOW)
 
+def pulse_histogram(pulses: list[int]) -> tuple[int, int]:
+    high = sum(pulse & 1 for pulse in pulses)
+    return len(pulses) - high, high
 
-def compute(s: str) -> int:
-    modules = _parse_module(s)
-    button = Button(modules["broadcaster"])
-    counts = {
-        Pulse.LOW: 0,
-        Pulse.HIGH: 0,
-    }
-    for _ in range(1000):
-        button.press()
-        queue = deque([button.press()])
-        while queue:
-            command = queue.popleft()
-            counts[command.pulse] += 1
-            # log(command)
-            module = modules[command.to]
-            queue.extend(module.process(command.pulse, command.from_))
-
-    return math.prod(counts.values())
-
-
-def _parse_module(s: str):
-    modules = {}
-    module_name_to_receivers_map = {}
-    receivers_to_senders_map = {}
-    for line in s.splitlines():
-        name, receivers = line.split(" -> ")
-        receivers = receivers.split(", ")
-        if name == "broadcaster":
-            modules[name] = Broadcaster(name)
-            module_name_to_receivers_map[name] = receivers
-        else:
-            type_, name = name[0], name[1:]
-            if type_ == "%":
-                modules[name] = FlipFlop(name)
-                module_name_to_receivers_map[name] = receivers
-            elif type_ == "&":
-                modules[name] = Conjunction(name)
-                module_name_to_receivers_map[name] = receivers
-        for receiver in receivers:
-            receivers_to_senders_map.setdefault(receiver, []).append(name)
-
-    for module_name, receiver_names in module_name_to_receivers_map.items():
-        modules[module_name].receivers = receiver_names
-        modules[module_name].inputs = list(
-            set(receivers_to_senders_map.get(module_name, []))
-        )
-        for receiver_name in receiver_names:
-            if receiver_name not in modules:
-                module = Debug(receiver_name)
-                modules[receiver_name] = module
 
-    return modules
+def sum_histograms(histograms: list[tuple[int, int]]) -> tuple[int, int]:
+    return sum(low for low, _ in histograms), sum(high for _, high in histograms)
 
 
 INPUT_S1 = """\
@@ -176,6 +238,51 @@ def test_debug(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
+def test_press_pulses_order() -> None:
+    network = Network.from_input(INPUT_S2)
+
+    pulses = [network.describe(pulse) for pulse in network.press()]
+
+    assert pulses == [
+        "button -low-> broadcaster",
+        "broadcaster -low-> a",
+        "a -high-> inv",
+        "a -high-> con",
+        "inv -low-> b",
+        "con -high-> output",
+        "b -high-> con",
+        "con -low-> output",
+    ]
+
+
+@pytest.mark.parametrize(
+    "input_s,presses,expected",
+    [
+        (INPUT_S1, 10**12, (8 * 10**12, 4 * 10**12)),
+        (INPUT_S2, 10**9, (4_250_000_000, 2_750_000_000)),
+    ],
+)
+def test_count_pulses_skips_cycle(
+    input_s: str, presses: int, expected: tuple[int, int]
+) -> None:
+    assert count_pulses(Network.from_input(input_s), presses) == expected
+
+
+@pytest.mark.parametrize("presses", [1, 3, 4, 5, 1000, 1001])
+def test_count_pulses_matches_simulation(presses: int) -> None:
+    histograms = press_histograms(Network.from_input(INPUT_S2), presses)
+
+    result = count_pulses(Network.from_input(INPUT_S2), presses)
+
+    assert result == sum_histograms(histograms)
+
+
+def test_press_histograms() -> None:
+    network = Network.from_input(INPUT_S2)
+
+    assert press_histograms(network, 4) == [(4, 4), (4, 2), (5, 3), (4, 2)]
+
+
 def test_input() -> None:
     result = compute(read_input())
 
@@ -192,7 +299,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 200
+        number_of_runs = 1000
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
@@ -3,152 +3,310 @@ from __future__ import annotations
 import math
 import sys
 import timeit
-from collections import deque
-from dataclasses import dataclass
-from enum import Enum
 from itertools import count
 from pathlib import Path
 
-from distlib.util import cached_property
+import pytest
 
 import support as sup
 
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
 
-class Pulse(Enum):
-    LOW = "low"
-    HIGH = "high"
-
-
-def log(command: Command) -> None:
-    print(f"{command.from_} -{command.pulse.value}-> {command.to}")
-
-
-@dataclass(frozen=True)
-class Command:
-    from_: str
-    to: str
-    pulse: Pulse
-
-
-class Module:
-    def __init__(self, name: str):
-        self.name = name
-        self.inputs: list[str] = []
-        self.receivers: list[str] = []
-
-    def __repr__(self) -> str:
-        return f"{type(self).__name__}({self.name!r})"
-
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        raise NotImplementedError
-
-    def _create_commands(self, pulse: Pulse) -> list[Command]:
-        return [
-            Command(from_=self.name, to=receiver, pulse=pulse)
-            for receiver in self.receivers
+BUTTON, BROADCASTER, FLIP_FLOP, CONJUNCTION, OUTPUT = range(5)
+LOW, HIGH = 0, 1
+PULSE_NAMES = ("low", "high")
+
+
+class Network:
+    """
+    Modules compiled to ints.
+
+    Every wire sender -> receiver is an edge id, a pulse is packed into
+    `edge << 1 | high`. Flip-flop memory is 0 or 1, conjunction memory
+    is a bitmask with a bit per input wire, so a conjunction sends low
+    when its memory equals `full` mask.
+    """
+
+    __slots__ = (
+        "names",
+        "ids",
+        "kinds",
+        "inputs",
+        "receivers",
+        "memory",
+        "_edge_receivers",
+        "_edge_bits",
+        "_full",
+        "_pulses",
+        "_button_pulse",
+    )
+
+    def __init__(
+        self, names: list[str], kinds: list[int], receivers: list[list[int]]
+    ) -> None:
+        self.names = names
+        self.ids = {name: module_id for module_id, name in enumerate(names)}
+        self.kinds = kinds
+        self.receivers = receivers
+        self.inputs: list[list[int]] = [[] for _ in names]
+        self._edge_receivers: list[int] = []
+        self._edge_bits: list[int] = []
+        edges: list[list[int]] = [[] for _ in names]
+        for sender, module_receivers in enumerate(receivers):
+            for receiver in module_receivers:
+                edges[sender].append(len(self._edge_receivers))
+                self._edge_receivers.append(receiver)
+                self._edge_bits.append(1 << len(self.inputs[receiver]))
+                self.inputs[receiver].append(sender)
+
+        self._full = [(1 << len(module_inputs)) - 1 for module_inputs in self.inputs]
+        # pulses module sends, indexed by module id and then by level
+        self._pulses = [
+            (
+                tuple(edge << 1 | LOW for edge in module_edges),
+                tuple(edge << 1 | HIGH for edge in module_edges),
+            )
+            for module_edges in edges
         ]
+        self._button_pulse = edges[self.ids["button"]][0] << 1 | LOW
+        self.memory = [0] * len(names)
+
+    @classmethod
+    def from_input(cls, s: str) -> Network:
+        kinds = {"button": BUTTON}
+        receivers = {"button": ["broadcaster"]}
+        for line in s.splitlines():
+            name, module_receivers = line.split(" -> ")
+            if name[0] == "%":
+                name, kind = name[1:], FLIP_FLOP
+            elif name[0] == "&":
+                name, kind = name[1:], CONJUNCTION
+            else:
+                kind = BROADCASTER
+            kinds[name] = kind
+            receivers[name] = module_receivers.split(", ")
+        for module_receivers in list(receivers.values()):
+            for receiver in module_receivers:
+                kinds.setdefault(receiver, OUTPUT)
+
+        names = list(kinds)
+        ids = {name: module_id for module_id, name in enumerate(names)}
+        return cls(
+            names,
+            [kinds[name] for name in names],
+            [[ids[receiver] for receiver in receivers.get(name, [])] for name in names],
+        )
 
+    def reset(self) -> None:
+        self.memory = [0] * len(self.names)
+
+    def press(self) -> list[int]:
+        """Push the button once, returns all packed pulses in order."""
+        memory = self.memory
+        kinds = self.kinds
+        edge_receivers = self._edge_receivers
+        edge_bits = self._edge_bits
+        full = self._full
+        pulses = self._pulses
+
+        queue = [self._button_pulse]
+        # list iterator sees items appended during the loop, so it's a queue
+        for pulse in queue:
+            edge = pulse >> 1
+            module = edge_receivers[edge]
+            kind = kinds[module]
+            if kind == FLIP_FLOP:
+                if pulse & 1:
+                    continue
+                level = memory[module] = memory[module] ^ 1
+            elif kind == CONJUNCTION:
+                if pulse & 1:
+                    state = memory[module] = memory[module] | edge_bits[edge]
+                else:
+                    state = memory[module] = memory[module] & ~edge_bits[edge]
+                level = state != full[module]
+            elif kind == BROADCASTER:
+                level = pulse & 1
+            else:
+                continue
+            queue += pulses[module][level]
+        return queue
+
+    def edge(self, sender: str, receiver: str) -> int:
+        sender_id, receiver_id = self.ids[sender], self.ids[receiver]
+        low_pulses, _ = self._pulses[sender_id]
+        for pulse in low_pulses:
+            if self._edge_receivers[pulse >> 1] == receiver_id:
+                return pulse >> 1
+        raise ValueError(f"No wire {sender} -> {receiver}")
+
+    def describe(self, pulse: int) -> str:
+        edge = pulse >> 1
+        receiver = self._edge_receivers[edge]
+        sender = self.inputs[receiver][self._edge_bits[edge].bit_length() - 1]
+        return (
+            f"{self.names[sender]} -{PULSE_NAMES[pulse & 1]}-> {self.names[receiver]}"
+        )
 
-class FlipFlop(Module):
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
-        self._is_on = False
-
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        if pulse == Pulse.HIGH:
-            return []
-        self._is_on = not self._is_on
-        return self._create_commands(Pulse.HIGH if self._is_on else Pulse.LOW)
-
-
-class Conjunction(Module):
-    @cached_property
-    def _memory(self):
-        return [False for _ in self.inputs]
-
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        index = self.inputs.index(sender)
-        self._memory[index] = pulse == Pulse.HIGH
-        return self._create_commands(Pulse.LOW if all(self._memory) else Pulse.HIGH)
-
-
-class Broadcaster(Module):
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        return self._create_commands(pulse)
-
-
-class Debug(Module):
-    def process(self, pulse: Pulse, sender: str) -> list[Command]:
-        return []
-
-
-class Button:
-    def __init__(self, broadcaster: Broadcaster) -> None:
-        self.name = "button"
-        self._broadcaster = broadcaster
 
-    def press(self) -> Command:
-        return Command(from_=self.name, to=self._broadcaster.name, pulse=Pulse.LOW)
+def compute(s: str) -> int:
+    return math.lcm(*subnetwork_periods(s))
+
+
+def subnetwork_periods(s: str) -> list[int]:
+    """
+    `rx` gets low when its only input, a conjunction, has got high pulses
+    from all its inputs in one press. Every broadcaster output starts its
+    own subnetwork which feeds exactly one of those inputs, so press
+    counts for them are found separately, without the whole network.
+    """
+    network = Network.from_input(s)
+    (final,) = network.inputs[network.ids["rx"]]
+
+    periods = []
+    used: set[int] = set()
+    feeders = []
+    for start in network.receivers[network.ids["broadcaster"]]:
+        modules = reachable(network, start, stop=final)
+        if modules & used:
+            raise ValueError("Subnetworks are not independent")
+        used |= modules
+        (feeder,) = [module for module in modules if final in network.receivers[module]]
+        feeders.append(feeder)
+
+        period = decode_counter(network, start, modules, feeder)
+        if period is None:
+            period = simulate_subnetwork(s, network, start, modules, feeder, final)
+        periods.append(period)
+
+    if sorted(feeders) != sorted(network.inputs[final]):
+        raise ValueError("Not every input of the final conjunction has a subnetwork")
+    return periods
+
+
+def reachable(network: Network, start: int, *, stop: int) -> set[int]:
+    modules = {start}
+    stack = [start]
+    while stack:
+        module = stack.pop()
+        for receiver in network.receivers[module]:
+            if receiver != stop and receiver not in modules:
+                modules.add(receiver)
+                stack.append(receiver)
+    return modules
 
 
-def compute(s: str) -> int:
-    modules = _parse_module(s)
-    button = Button(modules["broadcaster"])
-    conj = modules["rx"].inputs[0]
-    flops = {in_: 0 for in_ in modules[conj].inputs}
-    for i in count(1):
-        button.press()
-        queue = deque([button.press()])
-        while queue:
-            cmd = queue.popleft()
-            if cmd.pulse is Pulse.HIGH and cmd.from_ in flops and not flops[cmd.from_]:
-                flops[cmd.from_] = i
-                if all(flops.values()):
-                    return math.lcm(*flops.values())
-            # log(cmd)
-            module = modules[cmd.to]
-            queue.extend(module.process(cmd.pulse, cmd.from_))
+def decode_counter(
+    network: Network, start: int, modules: set[int], feeder: int
+) -> int | None:
+    """
+    Chain of flip-flops is a binary counter, flip-flop i is bit i.
+    Hub conjunction listens to bits which are 1 in its period. When they
+    are all on, it sends low to `feeder`, an inverter, which sends high
+    to the final conjunction. The same low pulse goes to the first and
+    all 0 bits and flips them, which carries the counter to zero
+    (flip-flops ignore high pulses). Returns None if subnetwork isn't
+    wired like that.
+    """
+    kinds, receivers = network.kinds, network.receivers
+    chain: list[int] = []
+    hubs = set()
+    module: int | None = start
+    while module is not None:
+        if kinds[module] != FLIP_FLOP or module in chain:
+            return None
+        chain.append(module)
+        next_modules = [m for m in receivers[module] if kinds[m] == FLIP_FLOP]
+        hubs.update(m for m in receivers[module] if kinds[m] == CONJUNCTION)
+        if len(next_modules) > 1 or len(hubs) > 1:
+            return None
+        module = next_modules[0] if next_modules else None
+
+    if len(hubs) != 1:
+        return None
+    (hub,) = hubs
+    bits = [hub in receivers[module] for module in chain]
+    reset = {module for module, bit in zip(chain, bits) if not bit} | {start}
+    flip_flops = {module for module in modules if kinds[module] == FLIP_FLOP}
+    if flip_flops != set(chain) or flip_flops & set(receivers[hub]) != reset:
+        return None
+    if set(receivers[hub]) - flip_flops != {feeder}:
+        return None
+    if kinds[feeder] != CONJUNCTION or network.inputs[feeder] != [hub]:
+        return None
+    return sum(1 << i for i, bit in enumerate(bits) if bit)
+
+
+def simulate_subnetwork(
+    s: str, network: Network, start: int, modules: set[int], feeder: int, final: int
+) -> int:
+    """Presses until `feeder` sends high, with only its subnetwork wired."""
+    names = {network.names[module] for module in modules}
+    lines = [f"broadcaster -> {network.names[start]}"]
+    for line in s.splitlines():
+        name, _ = line.split(" -> ")
+        if name.lstrip("%&") in names:
+            lines.append(line)
+    # final conjunction isn't in the subnetwork, so it's an output there
+    subnetwork = Network.from_input("\n".join(lines))
+    edge = subnetwork.edge(network.names[feeder], network.names[final])
+    watched = edge << 1 | HIGH
+    for press in count(1):
+        if watched in subnetwork.press():
+            return press
 
     raise RuntimeError("Unreachable")
 
 
-def _parse_module(s: str):
-    modules = {}
-    module_name_to_receivers_map = {}
-    receivers_to_senders_map = {}
-    for line in s.splitlines():
-        name, receivers = line.split(" -> ")
-        receivers = receivers.split(", ")
-        if name == "broadcaster":
-            modules[name] = Broadcaster(name)
-            module_name_to_receivers_map[name] = receivers
-        else:
-            type_, name = name[0], name[1:]
-            if type_ == "%":
-                modules[name] = FlipFlop(name)
-                module_name_to_receivers_map[name] = receivers
-            elif type_ == "&":
-                modules[name] = Conjunction(name)
-                module_name_to_receivers_map[name] = receivers
-        for receiver in receivers:
-            receivers_to_senders_map.setdefault(receiver, []).append(name)
-
-    for module_name, receiver_names in module_name_to_receivers_map.items():
-        for receiver_name in receiver_names:
-            if receiver_name not in modules:
-                module = Debug(receiver_name)
-                modules[receiver_name] = module
-                modules[receiver_name].inputs = list(
-                    set(receivers_to_senders_map.get(receiver_name, []))
-                )
-        modules[module_name].receivers = receiver_names
-        modules[module_name].inputs = list(
-            set(receivers_to_senders_map.get(module_name, []))
-        )
-
-    return modules
+def test_decoded_periods_match_simulation() -> None:
+    s = read_input()
+    network = Network.from_input(s)
+    (final,) = network.inputs[network.ids["rx"]]
+
+    for start in network.receivers[network.ids["broadcaster"]]:
+        modules = reachable(network, start, stop=final)
+        (feeder,) = [module for module in modules if final in network.receivers[module]]
+        decoded = decode_counter(network, start, modules, feeder)
+
+        assert decoded is not None
+        assert decoded == simulate_subnetwork(s, network, start, modules, feeder, final)
+
+
+COUNTER_S = """\
+broadcaster -> a
+%a -> b, hub
+%b -> hub
+&hub -> a, feeder
+&feeder -> final
+&final -> rx
+"""
+# hub drives final directly, without an inverter in between
+NO_INVERTER_S = """\
+broadcaster -> a
+%a -> b, hub
+%b -> hub
+&hub -> a, final
+&final -> rx
+"""
+
+
+@pytest.mark.parametrize(
+    "input_s,decoded,expected",
+    [(COUNTER_S, 3, 3), (NO_INVERTER_S, None, 1)],
+)
+def test_decode_counter(input_s: str, decoded: int | None, expected: int) -> None:
+    network = Network.from_input(input_s)
+    (final,) = network.inputs[network.ids["rx"]]
+    (start,) = network.receivers[network.ids["broadcaster"]]
+    modules = reachable(network, start, stop=final)
+    (feeder,) = network.inputs[final]
+
+    assert decode_counter(network, start, modules, feeder) == decoded
+    assert simulate_subnetwork(input_s, network, start, modules, feeder, final) == (
+        expected
+    )
+    assert compute(input_s) == expected
 
 
 def test_input() -> None:
@@ -167,7 +325,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 20
+        number_of_runs = 1000
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sys
 import timeit
 from pathlib import Path
-from typing import Callable, Generator
+from typing import Callable, Generator, Iterable
 
 import pytest
 
@@ -12,51 +12,66 @@ import support as sup
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
 
+PLOTS = bytes(1 if chr(i) in ".S" else 0 for i in range(256))
+
+
 def compute(s: str, steps_num: int = 64) -> int:
-    matrix, *_ = sup.make_matrix_from_input(s)
-    start = None
-    for m, row in enumerate(matrix):
-        for n, cell in enumerate(row):
-            if cell == "S":
-                start = (m, n)
-                break
-        if start:
-            break
+    return ReachableCounter.from_input(s).count(steps_num)
 
-    neighbors_cross = sup.max_bounds_closure(sup.neighbors_cross, matrix)
-    graph = make_graph_for_matrix(matrix, ["#"], neighbors_cross)
 
-    nodes = {start}
-    for _ in range(steps_num):
-        new_nodes = set()
-        for node in nodes:
-            for neighbor in graph[node]:
-                new_nodes.add(neighbor)
-        nodes = new_nodes
+class ReachableCounter:
+    """
+    Answers "how many cells are reachable in exactly k steps" for any k
+    after one BFS pass.
+
+    Cell at distance d can be reached in k steps if d <= k and d, k have
+    the same parity (we can always step back and forth), so answer is
+    a prefix sum of frontier sizes over levels with the same parity.
+    """
+
+    def __init__(self, level_sizes: Iterable[int]) -> None:
+        counts: list[int] = []
+        for steps, frontier_size in enumerate(level_sizes):
+            counts.append(frontier_size + (counts[steps - 2] if steps >= 2 else 0))
+        self._counts = counts
+
+    @classmethod
+    def from_input(cls, s: str) -> ReachableCounter:
+        grid = sup.Grid.from_input(s)
+        start_m, start_n = grid.find("S")
+        start = grid.index(start_m, start_n)
+        return cls(sup.bfs_level_sizes(make_neighbors(grid), start))
+
+    @property
+    def max_distance(self) -> int:
+        return len(self._counts) - 1
+
+    def count(self, steps: int) -> int:
+        if steps <= self.max_distance:
+            return self._counts[steps]
+        # all cells are already reached, only parity matters
+        last = self.max_distance
+        if (steps - last) % 2:
+            last -= 1
+        return self._counts[last] if last >= 0 else 0
+
+    def count_many(self, steps_list: Iterable[int]) -> list[int]:
+        return [self.count(steps) for steps in steps_list]
 
-    return len(nodes)
 
+def make_neighbors(grid: sup.Grid) -> Callable[[int], Generator[int, None, None]]:
+    # newlines in grid data are walls between rows,
+    # so it's enough to check the index is inside the data
+    plots = grid.data.translate(PLOTS)
+    size = len(plots)
+    stride = grid.stride
 
-def make_graph_for_matrix(
-    matrix,
-    obstacles: list[str],
-    neighbors: Callable[[int, int], Generator[tuple[int, int]]],
-    weight_calculator: Callable[[tuple[int, int]], int] | None = None,
-) -> dict:
-    graph = {}
-    for m, row in enumerate(matrix):
-        for n, cell in enumerate(row):
-            graph[(m, n)] = {}
-            if cell in obstacles:
-                continue
-            for neighbor in neighbors(m, n):
-                n_m, n_n = neighbor
-                if matrix[n_m][n_n] in obstacles:
-                    continue
-                graph[(m, n)][neighbor] = (
-                    weight_calculator((n_m, n_n)) if weight_calculator else 0
-                )
-    return graph
+    def neighbors(i: int) -> Generator[int, None, None]:
+        for j in (i - stride, i - 1, i + 1, i + stride):
+            if 0 <= j < size and plots[j]:
+                yield j
+
+    return neighbors
 
 
 INPUT_S = """\
@@ -85,6 +100,32 @@ def test_debug(input_s: str, expected: int) -> None:
     assert compute(input_s, steps_num=6) == expected
 
 
+def simulate(s: str, steps_num: int) -> int:
+    matrix, *_ = sup.make_matrix_from_input(s)
+    neighbors_cross = sup.max_bounds_closure(sup.neighbors_cross, matrix)
+    nodes = {
+        (m, n) for m, row in enumerate(matrix) for n, c in enumerate(row) if c == "S"
+    }
+    for _ in range(steps_num):
+        nodes = {
+            (n_m, n_n)
+            for node in nodes
+            for n_m, n_n in neighbors_cross(*node)
+            if matrix[n_m][n_n] != "#"
+        }
+    return len(nodes)
+
+
+def test_count_many() -> None:
+    steps_list = list(range(30))
+    counter = ReachableCounter.from_input(INPUT_S)
+
+    result = counter.count_many(steps_list)
+
+    assert result == [simulate(INPUT_S, steps) for steps in steps_list]
+    assert counter.count_many([5000, 5001]) == result[-2:]
+
+
 def test_input() -> None:
     result = compute(read_input())
 
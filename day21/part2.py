@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import sys
+import timeit
+from itertools import count
+from pathlib import Path
+from typing import Callable, Generator
+
+import pytest
+
+import support as sup
+
+INPUT_TXT = Path(__file__).parent / "input.txt"
+
+
+PLOTS = bytes(1 if chr(i) in ".S" else 0 for i in range(256))
+
+
+def compute(s: str, steps_num: int = 26_501_365) -> int:
+    return TiledGarden.from_input(s).count(steps_num)
+
+
+class TiledGarden:
+    """
+    Garden map repeats infinitely in every direction.
+
+    Number of reachable cells f(k) for k = rem + size * x (size of the map)
+    is a quadratic function of x once the BFS diamond is big enough,
+    because every next "ring" of maps adds a constant number of maps more
+    than the previous one. So we sample f at map-aligned steps until
+    last `stable_samples` second differences are equal and extrapolate
+    in closed form. BFS levels are cached, so many step counts can be asked.
+    """
+
+    def __init__(
+        self,
+        level_sizes: Generator[int, None, None],
+        size: int,
+        *,
+        stable_samples: int = 2,
+    ) -> None:
+        self.size = size
+        self.stable_samples = stable_samples
+        self._level_sizes = level_sizes
+        self._counts: list[int] = []
+
+    @classmethod
+    def from_input(cls, s: str, *, stable_samples: int = 2) -> TiledGarden:
+        grid = sup.Grid.from_input(s)
+        if grid.width != grid.height:
+            raise ValueError("Map must be square")
+        level_sizes = sup.bfs_level_sizes(make_tiled_neighbors(grid), grid.find("S"))
+        return cls(level_sizes, grid.height, stable_samples=stable_samples)
+
+    def count_exact(self, steps: int) -> int:
+        """Count by BFS distances, cost grows quadratically with steps."""
+        counts = self._counts
+        while len(counts) <= steps:
+            level = len(counts)
+            # infinite map never runs out of levels
+            frontier_size = next(self._level_sizes)
+            counts.append(frontier_size + (counts[level - 2] if level >= 2 else 0))
+        return counts[steps]
+
+    def count(self, steps: int) -> int:
+        rem, x = steps % self.size, steps // self.size
+        samples = []
+        for i in count():
+            samples.append(self.count_exact(rem + self.size * i))
+            if i == x:
+                return samples[-1]
+            if self._is_stable(samples):
+                break
+
+        a = len(samples) - 3
+        y0, y1, y2 = samples[a:]
+        t = x - a
+        return y0 + t * (y1 - y0) + t * (t - 1) // 2 * (y2 - 2 * y1 + y0)
+
+    def _is_stable(self, samples: list[int]) -> bool:
+        if len(samples) < self.stable_samples + 2:
+            return False
+        start = len(samples) - self.stable_samples - 2
+        tail = samples[start:]
+        second_diffs = {
+            tail[i + 2] - 2 * tail[i + 1] + tail[i] for i in range(len(tail) - 2)
+        }
+        return len(second_diffs) == 1
+
+
+def make_tiled_neighbors(
+    grid: sup.Grid,
+) -> Callable[[sup.Coords], Generator[sup.Coords, None, None]]:
+    plots = grid.data.translate(PLOTS)
+    height, width, stride = grid.height, grid.width, grid.stride
+
+    def neighbors(coords: sup.Coords) -> Generator[sup.Coords, None, None]:
+        m, n = coords
+        for next_m, next_n in ((m - 1, n), (m, n - 1), (m, n + 1), (m + 1, n)):
+            if plots[(next_m % height) * stride + next_n % width]:
+                yield next_m, next_n
+
+    return neighbors
+
+
+def brute_force(s: str, steps_num: int) -> int:
+    grid = sup.Grid.from_input(s)
+    neighbors = make_tiled_neighbors(grid)
+    nodes = {grid.find("S")}
+    for _ in range(steps_num):
+        nodes = {neighbor for node in nodes for neighbor in neighbors(node)}
+    return len(nodes)
+
+
+INPUT_S = """\
+...........
+.....###.#.
+.###.##..#.
+..#.#...#..
+....#.#....
+.##..S####.
+.##..#...#.
+.......##..
+.##.#.####.
+.##..##.##.
+...........
+"""
+
+
+@pytest.mark.parametrize(
+    "steps_num,expected",
+    [
+        (6, 16),
+        (10, 50),
+        (50, 1594),
+        (100, 6536),
+        (500, 167004),
+        (1000, 668697),
+        (5000, 16733044),
+    ],
+)
+def test_debug(steps_num: int, expected: int) -> None:
+    assert compute(INPUT_S, steps_num=steps_num) == expected
+
+
+@pytest.mark.parametrize("steps_num", [7, 43, 132, 150])
+def test_extrapolation_matches_brute_force(steps_num: int) -> None:
+    garden = TiledGarden.from_input(INPUT_S)
+
+    assert garden.count(steps_num) == brute_force(INPUT_S, steps_num)
+
+
+def test_input() -> None:
+    result = compute(read_input())
+
+    assert result == 617729401414635
+
+
+def read_input() -> str:
+    with open(INPUT_TXT) as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    input_data = read_input()
+    print("Answer is:     ", compute(input_data))
+
+    if "-b" in sys.argv:
+        number_of_runs = 3
+        bench_time = timeit.timeit(
+            "compute(data)",
+            setup="from __main__ import compute",
+            globals={"data": input_data},
+            number=number_of_runs,
+        )
+        print(f"{number_of_runs} runs took: {bench_time}s")
+        one_run = sup.humanized_seconds(bench_time / number_of_runs)
+        print(f"Average time:   {one_run}")
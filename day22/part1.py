@@ -1,11 +1,8 @@
 from __future__ import annotations
 
-import itertools
 import sys
 import timeit
-from dataclasses import dataclass
 from pathlib import Path
-from typing import NamedTuple
 
 import pytest
 
@@ -14,124 +11,83 @@ import support as sup
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
 
-class Coords(NamedTuple):
-    x: int
-    y: int
-    z: int
-
-    def __sub__(self, other: Coords) -> Coords:
-        return Coords(
-            self.x - other.x,
-            self.y - other.y,
-            self.z - other.z,
-        )
+GROUND = -1
 
 
-@dataclass
 class Brick:
-    start: Coords
-    end: Coords
-
-    @property
-    def id(self):
-        return (
-            f"{self.start.x},{self.start.y},{self.start.z}"
-            f"~{self.end.x},{self.end.y},{self.end.z}"
-        )
+    __slots__ = ("id", "x1", "y1", "z1", "x2", "y2", "z2")
 
-    @classmethod
-    def from_str(cls, s: str) -> Brick:
-        start, end = s.split("~")
-        return cls(
-            start=Coords(*map(int, start.split(",", 3))),
-            end=Coords(*map(int, end.split(","))),
-        )
-
-    def is_on_ground(self) -> bool:
-        return self.start.z == 1
+    def __init__(
+        self, brick_id: int, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int
+    ) -> None:
+        self.id = brick_id
+        self.x1, self.y1, self.z1 = x1, y1, z1
+        self.x2, self.y2, self.z2 = x2, y2, z2
 
-    def volume(self) -> int:
+    def __repr__(self) -> str:
         return (
-            (self.end.x - self.start.x + 1)
-            * (self.end.y - self.start.y + 1)
-            * (self.end.z - self.start.z + 1)
-        )
-
-    def expansion_direction(self) -> Coords:
-        return Coords(
-            abs(self.start.x - self.end.x) + 1,
-            abs(self.start.y - self.end.y) + 1,
-            abs(self.start.z - self.end.z) + 1,
-        )
-
-    def check_collision(self, other: Brick) -> bool:
-        return (self.start.x <= other.end.x and self.end.x >= other.start.x) and (
-            self.start.y <= other.end.y and self.end.y >= other.start.y
-        )
-
-    def move_down(self, blocks: int = 1) -> Brick:
-        return Brick(
-            start=self.start - Coords(0, 0, blocks),
-            end=self.end - Coords(0, 0, blocks),
+            f"{self.__class__.__name__}({self.id}: {self.x1},{self.y1},{self.z1}"
+            f"~{self.x2},{self.y2},{self.z2})"
         )
 
-
-def unfreeze(bricks):
-    for i, brick in enumerate(bricks):
-        tmp = brick.move_down()
-        while not check_collision(tmp, bricks) and tmp.start.z >= 1:
-            brick = brick.move_down()
-            bricks[i] = brick
-            tmp = tmp.move_down()
-
-    return bricks
-
-
-def check_collision(brick, other_bricks):
-    for other in other_bricks:
-        if brick.start.z != other.end.z:
-            continue
-
-        if brick.check_collision(other):
-            return True
-
-    return False
+    def drop_to(self, z: int) -> None:
+        self.z2 -= self.z1 - z
+        self.z1 = z
+
+
+def parse_bricks(s: str) -> list[Brick]:
+    """Bricks sorted by bottom z, ids are positions in that order."""
+    # every line is x1,y1,z1~x2,y2,z2
+    numbers = iter(sup.ints(s))
+    coords = list(zip(numbers, numbers, numbers, numbers, numbers, numbers))
+    coords.sort(key=lambda c: c[2])
+    return [Brick(brick_id, *c) for brick_id, c in enumerate(coords)]
+
+
+def settle(bricks: list[Brick]) -> tuple[list[list[int]], list[list[int]]]:
+    """
+    Drop bricks sorted by bottom z straight to their final z. Height map
+    keeps top z of every (x, y) column and `tops` keeps which brick is
+    there, so bricks a falling brick lands on are known without another pass.
+
+    :return: ids of bricks lying on every brick and ids of bricks
+        every brick lies on, both indexed by brick id
+    """
+    size_x = max(brick.x2 for brick in bricks) + 1
+    size_y = max(brick.y2 for brick in bricks) + 1
+    heights = [[0] * size_y for _ in range(size_x)]
+    tops = [[GROUND] * size_y for _ in range(size_x)]
+
+    supports: list[list[int]] = [[] for _ in bricks]
+    supported_by: list[list[int]] = [[] for _ in bricks]
+    for brick in bricks:
+        footprint = [
+            (x, y)
+            for x in range(brick.x1, brick.x2 + 1)
+            for y in range(brick.y1, brick.y2 + 1)
+        ]
+        z = max(heights[x][y] for x, y in footprint) + 1
+        brick.drop_to(z)
+
+        below_ids = supported_by[brick.id]
+        for x, y in footprint:
+            below = tops[x][y]
+            if below != GROUND and heights[x][y] == z - 1 and below not in below_ids:
+                below_ids.append(below)
+                supports[below].append(brick.id)
+            heights[x][y] = brick.z2
+            tops[x][y] = brick.id
+
+    return supports, supported_by
 
 
 def compute(s: str) -> int:
-    all_bricks = [Brick.from_str(line) for line in s.splitlines()]
-    all_bricks.sort(key=lambda b: b.start.z)
-    all_bricks = unfreeze(all_bricks)
-    all_bricks.sort(key=lambda b: b.start.z)
-
-    by_start_z = {
-        z: list(group)
-        for z, group in itertools.groupby(all_bricks, key=lambda b: b.start.z)
-    }
-    graph = {brick.id: {} for brick in all_bricks}
-    inverted_graph = {brick.id: {} for brick in all_bricks}
-    for brick in all_bricks:
-        for other in by_start_z.get(brick.end.z + 1, []):
-            if brick.check_collision(other):
-                graph[brick.id][other.id] = 0
-                inverted_graph[other.id][brick.id] = 0
-
-    bricks_to_delete = {brick_id for brick_id, bricks in graph.items() if not bricks}
-    for brick_id, bricks in inverted_graph.items():
-        if len(bricks) > 1:
-            for candidate in bricks:
-                if len(graph[candidate]) == 1:
-                    bricks_to_delete.add(candidate)
-                else:
-                    for other_brick_id in graph[candidate]:
-                        if other_brick_id == brick_id:
-                            continue
-                        if len(inverted_graph[other_brick_id]) == 1:
-                            break
-                    else:
-                        bricks_to_delete.add(candidate)
-
-    return len(bricks_to_delete)
+    supports, supported_by = settle(parse_bricks(s))
+
+    # brick can go if everything on it has another brick to lie on
+    return sum(
+        all(len(supported_by[other]) > 1 for other in others) for others in supports
+    )
 
 
 INPUT_S = """\
@@ -172,7 +128,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 3
+        number_of_runs = 100
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import sys
+import timeit
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+import support as sup
+
+INPUT_TXT = Path(__file__).parent / "input.txt"
+
+
+GROUND = -1
+
+
+class Brick:
+    __slots__ = ("id", "x1", "y1", "z1", "x2", "y2", "z2")
+
+    def __init__(
+        self, brick_id: int, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int
+    ) -> None:
+        self.id = brick_id
+        self.x1, self.y1, self.z1 = x1, y1, z1
+        self.x2, self.y2, self.z2 = x2, y2, z2
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.id}: {self.x1},{self.y1},{self.z1}"
+            f"~{self.x2},{self.y2},{self.z2})"
+        )
+
+    def drop_to(self, z: int) -> None:
+        self.z2 -= self.z1 - z
+        self.z1 = z
+
+
+def parse_bricks(s: str) -> list[Brick]:
+    """Bricks sorted by bottom z, ids are positions in that order."""
+    # every line is x1,y1,z1~x2,y2,z2
+    numbers = iter(sup.ints(s))
+    coords = list(zip(numbers, numbers, numbers, numbers, numbers, numbers))
+    coords.sort(key=lambda c: c[2])
+    return [Brick(brick_id, *c) for brick_id, c in enumerate(coords)]
+
+
+def settle(bricks: list[Brick]) -> tuple[list[list[int]], list[list[int]]]:
+    """
+    Drop bricks sorted by bottom z straight to their final z. Height map
+    keeps top z of every (x, y) column and `tops` keeps which brick is
+    there, so bricks a falling brick lands on are known without another pass.
+
+    :return: ids of bricks lying on every brick and ids of bricks
+        every brick lies on, both indexed by brick id
+    """
+    size_x = max(brick.x2 for brick in bricks) + 1
+    size_y = max(brick.y2 for brick in bricks) + 1
+    heights = [[0] * size_y for _ in range(size_x)]
+    tops = [[GROUND] * size_y for _ in range(size_x)]
+
+    supports: list[list[int]] = [[] for _ in bricks]
+    supported_by: list[list[int]] = [[] for _ in bricks]
+    for brick in bricks:
+        footprint = [
+            (x, y)
+            for x in range(brick.x1, brick.x2 + 1)
+            for y in range(brick.y1, brick.y2 + 1)
+        ]
+        z = max(heights[x][y] for x, y in footprint) + 1
+        brick.drop_to(z)
+
+        below_ids = supported_by[brick.id]
+        for x, y in footprint:
+            below = tops[x][y]
+            if below != GROUND and heights[x][y] == z - 1 and below not in below_ids:
+                below_ids.append(below)
+                supports[below].append(brick.id)
+            heights[x][y] = brick.z2
+            tops[x][y] = brick.id
+
+    return supports, supported_by
+
+
+def compute(s: str) -> int:
+    _, supported_by = settle(parse_bricks(s))
+    return sum(count_falling(supported_by))
+
+
+def count_falling(supported_by: list[list[int]]) -> list[int]:
+    """
+    Removing brick X makes brick Y fall exactly when every way from Y
+    down to the ground goes through X, i.e. X dominates Y. Ids are in
+    topological order, so immediate dominator of a brick is LCA of the
+    bricks it lies on in dominator tree built so far. Number of falling
+    bricks is size of the subtree without X itself.
+    """
+    bricks_num = len(supported_by)
+    root = bricks_num  # ground
+    parent = [root] * (bricks_num + 1)
+    depth = [0] * (bricks_num + 1)
+
+    def lca(a: int, b: int) -> int:
+        while a != b:
+            if depth[a] < depth[b]:
+                b = parent[b]
+            else:
+                a = parent[a]
+        return a
+
+    for brick in range(bricks_num):
+        below = supported_by[brick] or [root]
+        dominator = below[0]
+        for other in below[1:]:
+            dominator = lca(dominator, other)
+        parent[brick] = dominator
+        depth[brick] = depth[dominator] + 1
+
+    sizes = [1] * (bricks_num + 1)
+    for brick in reversed(range(bricks_num)):
+        sizes[parent[brick]] += sizes[brick]
+    return [size - 1 for size in sizes[:bricks_num]]
+
+
+def count_falling_bfs(
+    supports: list[list[int]], supported_by: list[list[int]]
+) -> list[int]:
+    result = []
+    for removed in range(len(supports)):
+        fallen = {removed}
+        queue = deque([removed])
+        while queue:
+            brick = queue.popleft()
+            for above in supports[brick]:
+                if above not in fallen and all(
+                    b in fallen for b in supported_by[above]
+                ):
+                    fallen.add(above)
+                    queue.append(above)
+        result.append(len(fallen) - 1)
+    return result
+
+
+INPUT_S = """\
+1,0,1~1,2,1
+0,0,2~2,0,2
+0,2,3~2,2,3
+0,0,4~0,2,4
+2,0,5~2,2,5
+0,1,6~2,1,6
+1,1,8~1,1,9
+"""
+EXPECTED = 7
+
+
+@pytest.mark.parametrize(
+    "input_s,expected",
+    [
+        (INPUT_S, EXPECTED),
+    ],
+)
+def test_debug(input_s: str, expected: int) -> None:
+    assert compute(input_s) == expected
+
+
+def test_count_falling_matches_bfs() -> None:
+    supports, supported_by = settle(parse_bricks(INPUT_S))
+
+    result = count_falling(supported_by)
+
+    assert result == count_falling_bfs(supports, supported_by)
+    assert result == [6, 0, 0, 0, 0, 1, 0]
+
+
+def test_input() -> None:
+    result = compute(read_input())
+
+    assert result == 63166
+
+
+def read_input() -> str:
+    with open(INPUT_TXT) as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    input_data = read_input()
+    print("Answer is:     ", compute(input_data))
+
+    if "-b" in sys.argv:
+        number_of_runs = 100
+        bench_time = timeit.timeit(
+            "compute(data)",
+            setup="from __main__ import compute",
+            globals={"data": input_data},
+            number=number_of_runs,
+        )
+        print(f"{number_of_runs} runs took: {bench_time}s")
+        one_run = sup.humanized_seconds(bench_time / number_of_runs)
+        print(f"Average time:   {one_run}")
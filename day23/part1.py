@@ -11,34 +11,103 @@ import support as sup
 INPUT_TXT = Path(__file__).parent / "input.txt"
 
 
-SLIDES_MAP = {
-    "up": "^",
-    "right": ">",
-    "down": "v",
-    "left": "<",
-}
+DOT = ord(".")
+WALL = ord("#")
+# slope which can be entered moving in the direction: up, right, down, left
+SLOPES = tuple(map(ord, "^>v<"))
+
+Graph = list[list[tuple[int, int]]]
 
 
 def compute(s: str) -> int:
-    matrix, m_len, n_len = sup.make_matrix_from_input(s)
-    next_coords = sup.max_bounds_closure(sup.next_coords, matrix)
-    start = (0, 1)
-    end = (m_len - 1, n_len - 2)
-
-    maximum = 0
-    stack = [(start, {start})]
-    while stack:
-        node, seen = stack.pop()
-        for direction in SLIDES_MAP:
-            candidate = next_coords(*node, direction)
-            if not candidate:
+    graph, start, end = make_junction_graph(sup.Grid.from_input(s), slopes=True)
+    return longest_path(graph, start, end)
+
+
+def make_junction_graph(grid: sup.Grid, *, slopes: bool) -> tuple[Graph, int, int]:
+    """
+    Collapse corridors of the maze into weighted edges between junctions
+    (cells with 3+ ways out, start and end). With `slopes` a corridor
+    is an edge only in the direction all of its slopes allow.
+    """
+    stride = grid.stride
+    deltas = (-stride, 1, stride, -1)
+    # wall rows around the grid, newlines are walls too,
+    # so cell (m, n) is at index (m + 1) * stride + n
+    cells = b"#" * stride + grid.data.replace(b"\n", b"#") + b"#" * stride
+
+    start = stride + grid.index(0, 1)
+    end = stride + grid.index(grid.height - 1, grid.width - 2)
+    junctions = {start: 0, end: 1}
+    for i in range(stride, len(cells) - stride):
+        if cells[i] != WALL and [cells[i + delta] for delta in deltas].count(WALL) <= 1:
+            junctions[i] = len(junctions)
+
+    graph: Graph = [[] for _ in junctions]
+    for junction, node in junctions.items():
+        for direction, delta in enumerate(deltas):
+            prev, i, length = junction, junction + delta, 1
+            step_direction = direction
+            passable = True
+            while cells[i] != WALL:
+                if cells[i] != DOT and cells[i] != SLOPES[step_direction]:
+                    passable = False
+                if i in junctions:
+                    if passable or not slopes:
+                        graph[node].append((junctions[i], length))
+                    break
+                # corridors between junctions don't fork
+                for next_direction, next_delta in enumerate(deltas):
+                    if i + next_delta != prev and cells[i + next_delta] != WALL:
+                        prev, i, length = i, i + next_delta, length + 1
+                        step_direction = next_direction
+                        break
+                else:
+                    break  # dead end
+
+    return graph, junctions[start], junctions[end]
+
+
+def longest_path(graph: Graph, start: int, end: int) -> int:
+    """
+    DFS over all simple paths, visited junctions are an int bitmask.
+    Returns -1 if end can't be reached.
+    """
+    target, tail = end, 0
+    # the only junction next to the end must go there, otherwise
+    # the end is cut off from the rest of the path
+    last = [
+        (node, length)
+        for node, edges in enumerate(graph)
+        for next_node, length in edges
+        if next_node == end
+    ]
+    if len(last) == 1:
+        target, tail = last[0]
+    if start == target:
+        return tail
+
+    edges_with_bits = [
+        [(next_node, 1 << next_node, length) for next_node, length in edges]
+        for edges in graph
+    ]
+
+    def dfs(node: int, visited: int) -> int:
+        best = -1
+        for next_node, bit, length in edges_with_bits[node]:
+            if next_node == target:
+                distance = tail
+            elif not visited & bit:
+                distance = dfs(next_node, visited | bit)
+                if distance < 0:
+                    continue
+            else:
                 continue
-            value = matrix[candidate[0]][candidate[1]]
-            if candidate == end:
-                maximum = max(maximum, len(seen))
-            elif candidate not in seen and value in [".", SLIDES_MAP[direction]]:
-                stack.append((candidate, seen | {candidate}))
-    return maximum
+            if distance + length > best:
+                best = distance + length
+        return best
+
+    return dfs(start, 1 << start)
 
 
 INPUT_S = """\
@@ -95,7 +164,7 @@ if __name__ == "__main__":
     print("Answer is:     ", compute(input_data))
 
     if "-b" in sys.argv:
-        number_of_runs = 10
+        number_of_runs = 100
         bench_time = timeit.timeit(
             "compute(data)",
             setup="from __main__ import compute",
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+import pytest
+
+import support as sup
+
+INPUT_TXT = Path(__file__).parent / "input.txt"
+
+
+DOT = ord(".")
+WALL = ord("#")
+# slope which can be entered moving in the direction: up, right, down, left
+SLOPES = tuple(map(ord, "^>v<"))
+
+Graph = list[list[tuple[int, int]]]
+
+
+def compute(s: str) -> int:
+    graph, start, end = make_junction_graph(sup.Grid.from_input(s), slopes=False)
+    return longest_path(graph, start, end)
+
+
+def make_junction_graph(grid: sup.Grid, *, slopes: bool) -> tuple[Graph, int, int]:
+    """
+    Collapse corridors of the maze into weighted edges between junctions
+    (cells with 3+ ways out, start and end). With `slopes` a corridor
+    is an edge only in the direction all of its slopes allow.
+    """
+    stride = grid.stride
+    deltas = (-stride, 1, stride, -1)
+    # wall rows around the grid, newlines are walls too,
+    # so cell (m, n) is at index (m + 1) * stride + n
+    cells = b"#" * stride + grid.data.replace(b"\n", b"#") + b"#" * stride
+
+    start = stride + grid.index(0, 1)
+    end = stride + grid.index(grid.height - 1, grid.width - 2)
+    junctions = {start: 0, end: 1}
+    for i in range(stride, len(cells) - stride):
+        if cells[i] != WALL and [cells[i + delta] for delta in deltas].count(WALL) <= 1:
+            junctions[i] = len(junctions)
+
+    graph: Graph = [[] for _ in junctions]
+    for junction, node in junctions.items():
+        for direction, delta in enumerate(deltas):
+            prev, i, length = junction, junction + delta, 1
+            step_direction = direction
+            passable = True
+            while cells[i] != WALL:
+                if cells[i] != DOT and cells[i] != SLOPES[step_direction]:
+                    passable = False
+                if i in junctions:
+                    if passable or not slopes:
+                        graph[node].append((junctions[i], length))
+                    break
+                # corridors between junctions don't fork
+                for next_direction, next_delta in enumerate(deltas):
+                    if i + next_delta != prev and cells[i + next_delta] != WALL:
+                        prev, i, length = i, i + next_delta, length + 1
+                        step_direction = next_direction
+                        break
+                else:
+                    break  # dead end
+
+    return graph, junctions[start], junctions[end]
+
+
+def longest_path(graph: Graph, start: int, end: int) -> int:
+    """
+    DFS over all simple paths, visited junctions are an int bitmask.
+    Returns -1 if end can't be reached.
+    """
+    target, tail = end, 0
+    # the only junction next to the end must go there, otherwise
+    # the end is cut off from the rest of the path
+    last = [
+        (node, length)
+        for node, edges in enumerate(graph)
+        for next_node, length in edges
+        if next_node == end
+    ]
+    if len(last) == 1:
+        target, tail = last[0]
+    if start == target:
+        return tail
+
+    edges_with_bits = [
+        [(next_node, 1 << next_node, length) for next_node, length in edges]
+        for edges in graph
+    ]
+
+    def dfs(node: int, visited: int) -> int:
+        best = -1
+        for next_node, bit, length in edges_with_bits[node]:
+            if next_node == target:
+                distance = tail
+            elif not visited & bit:
+                distance = dfs(next_node, visited | bit)
+                if distance < 0:
+                    continue
+            else:
+                continue
+            if distance + length > best:
+                best = distance + length
+        return best
+
+    return dfs(start, 1 << start)
+
+
+INPUT_S = """\
+#.#####################
+#.......#########...###
+#######.#########.#.###
+###.....#.>.>.###.#.###
+###v#####.#v#.###.#.###
+###.>...#.#.#.....#...#
+###v###.#.#.#########.#
+###...#.#.#.......#...#
+#####.#.#.#######.#.###
+#.....#.#.#.......#...#
+#.#####.#.#.#########v#
+#.#...#...#...###...>.#
+#.#.#v#######v###.###v#
+#...#.>.#...>.>.#.###.#
+#####v#.#.###v#.#.###.#
+#.....#...#...#.#.#...#
+#.#########.###.#.#.###
+#...###...#...#...#.###
+###.###.#.###v#####v###
+#...#...#.#.>.>.#.>.###
+#.###.###.#.###.#.#v###
+#.....###...###...#...#
+#####################.#
+"""
+EXPECTED = 154
+
+
+@pytest.mark.parametrize(
+    "input_s,expected",
+    [
+        (INPUT_S, EXPECTED),
+    ],
+)
+def test_debug(input_s: str, expected: int) -> None:
+    assert compute(input_s) == expected
+
+
+def test_input() -> None:
+    result = compute(read_input())
+
+    assert result == 6670
+
+
+def read_input() -> str:
+    with open(INPUT_TXT) as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    input_data = read_input()
+    print("Answer is:     ", compute(input_data))
+
+    if "-b" in sys.argv:
+        number_of_runs = 1
+        bench_time = timeit.timeit(
+            "compute(data)",
+            setup="from __main__ import compute",
+            globals={"data": input_data},
+            number=number_of_runs,
+        )
+        print(f"{number_of_runs} runs took: {bench_time}s")
+        one_run = sup.humanized_seconds(bench_time / number_of_runs)
+        print(f"Average time:   {one_run}")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 import contextlib
 import heapq
+import itertools
 import os.path
 import re
 import sys
@@ -10,6 +12,7 @@ import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from array import array
 from collections import deque
 from functools import partial
 from typing import Any, Callable, Generator, Hashable, Iterable, TextIO, TypeVar
@@ -194,6 +197,22 @@ def iter_lines_as_numbers(s: str) -> Generator[int, None, None]:
         yield int(line)
 
 
+# bytes that can't be a part of an int become spaces
+_UNSIGNED_INT_BYTES = bytes(c if c in b"0123456789" else ord(" ") for c in range(256))
+_SIGNED_INT_BYTES = bytes(c if c in b"-0123456789" else ord(" ") for c in range(256))
+
+
+def ints(s: str, *, signed: bool = False) -> list[int]:
+    """
+    All ints of s, separated by any other characters. Done on bytes with
+    translate and split, both run in C, so it is faster than splitting
+    every line by hand. With `signed` "-" may only be a sign ("a-b" and
+    "1-2" raise ValueError), otherwise it is a separator.
+    """
+    table = _SIGNED_INT_BYTES if signed else _UNSIGNED_INT_BYTES
+    return list(map(int, s.encode().translate(table).split()))
+
+
 class Range:
     __slots__ = ("start", "end")
 
@@ -238,6 +257,233 @@ class Range:
         return result
 
 
+class RangeSet:
+    """
+    Sorted, non-overlapping half-open ranges kept in two parallel int
+    arrays. Touching ranges are merged, so every set has one representation.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges: Iterable[Range] = ()) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self._extend_sorted(sorted((r.start, r.end) for r in ranges))
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[int, int]]) -> RangeSet:
+        range_set = cls()
+        range_set._extend_sorted(sorted(pairs))
+        return range_set
+
+    def _extend_sorted(self, pairs: Iterable[tuple[int, int]]) -> None:
+        starts, ends = self.starts, self.ends
+        for start, end in pairs:
+            if start >= end:
+                continue
+            if ends and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+    def __repr__(self) -> str:
+        ranges = ", ".join(f"({start}, {end})" for start, end in self._pairs())
+        return f"{self.__class__.__name__}([{ranges}])"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RangeSet):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Generator[Range, None, None]:
+        return (Range(start, end) for start, end in self._pairs())
+
+    def __contains__(self, n: int) -> bool:
+        i = bisect.bisect_right(self.starts, n) - 1
+        return i >= 0 and n < self.ends[i]
+
+    def _pairs(self) -> Iterable[tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def total(self) -> int:
+        """Number of ints in all ranges."""
+        return sum(self.ends) - sum(self.starts)
+
+    def union(self, other: RangeSet) -> RangeSet:
+        # both are sorted, so sort only merges two runs
+        return self.from_pairs([*self._pairs(), *other._pairs()])
+
+    def intersection(self, other: RangeSet) -> RangeSet:
+        a_starts, a_ends = self.starts, self.ends
+        b_starts, b_ends = other.starts, other.ends
+        pairs = []
+        i = j = 0
+        while i < len(a_starts) and j < len(b_starts):
+            start = max(a_starts[i], b_starts[j])
+            end = min(a_ends[i], b_ends[j])
+            if start < end:
+                pairs.append((start, end))
+            if a_ends[i] < b_ends[j]:
+                i += 1
+            else:
+                j += 1
+        result = self.__class__()
+        result._extend_sorted(pairs)
+        return result
+
+    def difference(self, other: RangeSet) -> RangeSet:
+        b_starts, b_ends = other.starts, other.ends
+        pairs = []
+        j = 0
+        for start, end in self._pairs():
+            while j < len(b_starts) and b_ends[j] <= start:
+                j += 1
+            current = start
+            k = j
+            while k < len(b_starts) and b_starts[k] < end:
+                if b_starts[k] > current:
+                    pairs.append((current, b_starts[k]))
+                current = max(current, b_ends[k])
+                k += 1
+            if current < end:
+                pairs.append((current, end))
+        result = self.__class__()
+        result._extend_sorted(pairs)
+        return result
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def apply_mapping(self, mapping_table: Iterable[tuple[Range, int]]) -> RangeSet:
+        """
+        Map every int through piecewise-linear map in one sweep. Ints in
+        a source range of the table are moved by its offset, the rest
+        stay. Source ranges of the table must not overlap.
+        """
+        pieces = sorted(
+            (source.start, source.end, offset) for source, offset in mapping_table
+        )
+        pairs = []
+        j = 0
+        for start, end in self._pairs():
+            while j < len(pieces) and pieces[j][1] <= start:
+                j += 1
+            current = start
+            k = j
+            while k < len(pieces) and pieces[k][0] < end:
+                piece_start, piece_end, offset = pieces[k]
+                if piece_start > current:
+                    pairs.append((current, piece_start))
+                    current = piece_start
+                mapped_end = min(end, piece_end)
+                pairs.append((current + offset, mapped_end + offset))
+                current = mapped_end
+                k += 1
+            if current < end:
+                pairs.append((current, end))
+        return self.from_pairs(pairs)
+
+
+class PiecewiseLinearMap:
+    """
+    Map of ints which adds an offset depending on the piece an int falls in.
+
+    Piece i is [breakpoints[i], breakpoints[i + 1]), the last one is
+    unbounded. First breakpoint is the smallest int64, so every int has
+    a piece, ints outside of the table pieces are mapped to themselves.
+    Maps compose into one map with the same representation, so a chain
+    of maps costs one bisect per int.
+    """
+
+    __slots__ = ("breakpoints", "offsets")
+
+    MIN = -(2**63)
+    MAX = 2**63 - 1
+
+    def __init__(self, mapping_table: Iterable[tuple[Range, int]] = ()) -> None:
+        breakpoints = [self.MIN]
+        offsets = [0]
+        for source, offset in sorted(mapping_table, key=lambda item: item[0].start):
+            if source.start < breakpoints[-1]:
+                raise ValueError(f"{source} overlaps with another piece")
+            if source.start == breakpoints[-1]:
+                offsets[-1] = offset
+            else:
+                breakpoints.append(source.start)
+                offsets.append(offset)
+            breakpoints.append(source.end)
+            offsets.append(0)
+        self._set_pieces(breakpoints, offsets)
+
+    def _set_pieces(self, breakpoints: list[int], offsets: list[int]) -> None:
+        self.breakpoints = array("q")
+        self.offsets = array("q")
+        for breakpoint, offset in zip(breakpoints, offsets):
+            # neighbour pieces with the same offset are one piece
+            if self.offsets and self.offsets[-1] == offset:
+                continue
+            self.breakpoints.append(breakpoint)
+            self.offsets.append(offset)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self.table())!r})"
+
+    def __call__(self, n: int) -> int:
+        return n + self.offsets[bisect.bisect_right(self.breakpoints, n) - 1]
+
+    def _pieces(self) -> Iterable[tuple[int, int, int]]:
+        ends = itertools.chain(itertools.islice(self.breakpoints, 1, None), [self.MAX])
+        return zip(self.breakpoints, ends, self.offsets)
+
+    def table(self) -> Generator[tuple[Range, int], None, None]:
+        """Pieces which move ints, in format `RangeSet.apply_mapping` takes."""
+        for start, end, offset in self._pieces():
+            if offset:
+                yield Range(start, end), offset
+
+    def compose(self, then: PiecewiseLinearMap) -> PiecewiseLinearMap:
+        """Map which is `then(self(n))`."""
+        then_breakpoints, then_offsets = then.breakpoints, then.offsets
+        breakpoints, offsets = [], []
+        for start, end, offset in self._pieces():
+            # pieces of `then` which cover image of this piece
+            i = bisect.bisect_right(then_breakpoints, start + offset) - 1
+            breakpoints.append(start)
+            offsets.append(offset + then_offsets[i])
+            i += 1
+            while i < len(then_breakpoints) and then_breakpoints[i] < end + offset:
+                breakpoints.append(then_breakpoints[i] - offset)
+                offsets.append(offset + then_offsets[i])
+                i += 1
+
+        result = self.__class__()
+        result._set_pieces(breakpoints, offsets)
+        return result
+
+    def map_ranges(self, range_set: RangeSet) -> RangeSet:
+        """Like `RangeSet.apply_mapping`, but only looks at breakpoints in ranges."""
+        breakpoints, offsets = self.breakpoints, self.offsets
+        pairs = []
+        for start, end in zip(range_set.starts, range_set.ends):
+            i = bisect.bisect_right(breakpoints, start) - 1
+            current = start
+            while True:
+                i += 1
+                piece_end = breakpoints[i] if i < len(breakpoints) else end
+                piece_end = min(piece_end, end)
+                pairs.append((current + offsets[i - 1], piece_end + offsets[i - 1]))
+                if piece_end == end:
+                    break
+                current = piece_end
+        return RangeSet.from_pairs(pairs)
+
+
 Coords = tuple[int, int]
 inf_coords = (float("inf"), float("inf"))
 T = TypeVar("T")
@@ -260,6 +506,194 @@ def make_matrix_from_input(
     return matrix, m_len, n_len
 
 
+_BYTE_TO_STR = tuple(chr(i) for i in range(256))
+_BYTE_TO_INT = tuple(range(256))
+_DIGITS_TO_INTS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+class GridView:
+    """
+    Row or column of a Grid. Backed by a memoryview, so it doesn't copy
+    cells and writes go straight to the grid.
+    """
+
+    __slots__ = ("_data", "_decode", "_encode")
+
+    def __init__(
+        self, data: memoryview, decode: tuple[Any, ...], encode: Callable[[Any], int]
+    ) -> None:
+        self._data = data
+        self._decode = decode
+        self._encode = encode
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, i: int) -> Any:
+        return self._decode[self._data[i]]
+
+    def __setitem__(self, i: int, value: Any) -> None:
+        self._data[i] = self._encode(value)
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        decode = self._decode
+        return (decode[b] for b in self._data)
+
+
+class Grid:
+    """
+    2D grid stored in one flat bytearray.
+
+    Cell (m, n) lives at index `m * stride + n`. Stride can be bigger than
+    width, e.g. `from_input` keeps newlines as a padding column,
+    so the input doesn't have to be copied cell by cell.
+
+    Supports `grid[m, n]` access, `grid.at(i)` for flat indexes and
+    `grid[m][n]` (through row view), so it can be used in place of matrix
+    from `make_matrix_from_input`: negative indexes count from the end and
+    out of range ones raise IndexError. `index` and `at` don't check bounds,
+    they are for hot loops. Cells are single chars or ints in 0..255.
+    """
+
+    __slots__ = ("data", "width", "height", "stride", "cast_func", "_decode", "_encode")
+
+    def __init__(
+        self,
+        data: bytearray,
+        width: int,
+        height: int,
+        stride: int | None = None,
+        *,
+        cast_func: Callable[[str], Any] = str,
+    ) -> None:
+        if stride is None:
+            stride = width
+        if stride < width:
+            raise ValueError(f"{stride=} must be >= {width=}")
+        if len(data) < (height - 1) * stride + width:
+            raise ValueError(f"Not enough data for {width}x{height} grid")
+
+        self.data = data
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self.cast_func = cast_func
+        if cast_func is str:
+            self._decode = _BYTE_TO_STR
+            self._encode = ord
+        elif cast_func is int:
+            self._decode = _BYTE_TO_INT
+            self._encode = int
+        else:
+            raise ValueError(f"Unsupported {cast_func=}, only str and int allowed")
+
+    @classmethod
+    def from_input(cls, s: str, *, cast_func: Callable[[str], Any] = str) -> Grid:
+        data = bytearray(s.strip().encode())
+        width = data.find(b"\n")
+        if width < 0:
+            width = len(data)
+        stride = width + 1
+        # pad last row, so every row has a newline at the end
+        data += b"\n"
+        height = len(data) // stride
+        if len(data) != height * stride or data[width::stride] != b"\n" * height:
+            raise ValueError("All lines must have the same length")
+
+        if cast_func is int:
+            if not_digits := data.translate(None, b"0123456789\n"):
+                raise ValueError(f"Not a digit cell {chr(not_digits[0])!r}")
+            data = data.translate(_DIGITS_TO_INTS)
+        return cls(data, width, height, stride, cast_func=cast_func)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.width}x{self.height})"
+
+    def __str__(self) -> str:
+        return "\n".join("".join(map(str, row)) for row in self)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, key: Coords | int) -> Any:
+        if type(key) is tuple:
+            return self._decode[self.data[self._checked_index(*key)]]
+        return self.row(key)
+
+    def __setitem__(self, key: Coords, value: Any) -> None:
+        self.data[self._checked_index(*key)] = self._encode(value)
+
+    def _checked_index(self, m: int, n: int) -> int:
+        if m < 0:
+            m += self.height
+        if n < 0:
+            n += self.width
+        if not (0 <= m < self.height and 0 <= n < self.width):
+            raise IndexError(f"Cell {m, n} out of range")
+        return m * self.stride + n
+
+    def __iter__(self) -> Generator[GridView, None, None]:
+        return (self.row(m) for m in range(self.height))
+
+    def __contains__(self, coords: Coords) -> bool:
+        m, n = coords
+        return 0 <= m < self.height and 0 <= n < self.width
+
+    @property
+    def max_bounds(self) -> Coords:
+        return self.height - 1, self.width - 1
+
+    def index(self, m: int, n: int) -> int:
+        return m * self.stride + n
+
+    def coords(self, i: int) -> Coords:
+        return divmod(i, self.stride)
+
+    def at(self, i: int) -> Any:
+        return self._decode[self.data[i]]
+
+    def row(self, m: int) -> GridView:
+        if m < 0:
+            m += self.height
+        if not 0 <= m < self.height:
+            raise IndexError(f"Row {m} out of range")
+        start = m * self.stride
+        end = start + self.width
+        data = memoryview(self.data)[start:end]
+        return GridView(data, self._decode, self._encode)
+
+    def column(self, n: int) -> GridView:
+        if n < 0:
+            n += self.width
+        if not 0 <= n < self.width:
+            raise IndexError(f"Column {n} out of range")
+        end = (self.height - 1) * self.stride + n + 1
+        stride = self.stride
+        data = memoryview(self.data)[n:end:stride]
+        return GridView(data, self._decode, self._encode)
+
+    def find(self, value: Any) -> Coords | None:
+        i = self.data.find(self._encode(value))
+        while i >= 0:
+            m, n = self.coords(i)
+            if n < self.width:
+                return m, n
+            i = self.data.find(self._encode(value), i + 1)
+        return None
+
+    def copy(self) -> Grid:
+        return self.__class__(
+            self.data.copy(),
+            self.width,
+            self.height,
+            self.stride,
+            cast_func=self.cast_func,
+        )
+
+
 FilterFunc = Callable[[Iterable[Coords]], Generator[Coords, None, None]]
 
 
@@ -359,7 +793,7 @@ def num_of_next_coords(
 TC = TypeVar("TC")
 
 
-def max_bounds_closure(func: TC, matrix: list[list[Any]]) -> TC:
+def max_bounds_closure(func: TC, matrix: list[list[Any]] | Grid) -> TC:
     max_bounds = (len(matrix) - 1, len(matrix[0]) - 1)
     return partial(func, max_bounds=max_bounds)
 
@@ -380,19 +814,244 @@ def bfs(graph: dict[HT, dict[HT, int]], source: HT) -> dict[HT, HT]:
     return prev
 
 
+def bfs_levels(
+    neighbors: Callable[[HT], Iterable[HT]], source: HT
+) -> Generator[list[HT], None, None]:
+    """
+    Level-synchronous BFS, yields frontiers one by one:
+    k-th frontier holds all vertices at distance k from source.
+
+    Frontiers are lists and only one set of seen vertices is kept
+    for the whole search. Stop iterating to stop the search.
+    For dict graphs use `graph.__getitem__` as neighbors.
+    """
+    seen = {source}
+    frontier = [source]
+    while frontier:
+        yield frontier
+        next_frontier = []
+        for u in frontier:
+            for vertex in neighbors(u):
+                if vertex not in seen:
+                    seen.add(vertex)
+                    next_frontier.append(vertex)
+        frontier = next_frontier
+
+
+def bfs_level_sizes(
+    neighbors: Callable[[HT], Iterable[HT]], source: HT
+) -> Generator[int, None, None]:
+    for frontier in bfs_levels(neighbors, source):
+        yield len(frontier)
+
+
+def bfs_bidirectional(
+    neighbors: Callable[[HT], Iterable[HT]],
+    source: HT,
+    target: HT,
+    *,
+    reverse_neighbors: Callable[[HT], Iterable[HT]] | None = None,
+) -> list[HT]:
+    """
+    Shortest path from source to target in unweighted graph.
+
+    Searches from both ends, every time the smaller frontier is expanded,
+    so it visits far fewer vertices than `bfs` on big graphs.
+    For directed graphs pass `reverse_neighbors` (incoming edges).
+
+    :return: list of vertices from source to target,
+        empty list if target is unreachable
+    """
+    if reverse_neighbors is None:
+        reverse_neighbors = neighbors
+
+    prev = {source: None}
+    next_ = {target: None}
+    depth_forward = {source: 0}
+    depth_backward = {target: 0}
+    forward = [source]
+    backward = [target]
+    meet = source if source == target else None
+    while meet is None and forward and backward:
+        if len(forward) <= len(backward):
+            forward, meet = _bfs_expand_level(
+                forward, neighbors, prev, depth_forward, depth_backward
+            )
+        else:
+            backward, meet = _bfs_expand_level(
+                backward, reverse_neighbors, next_, depth_backward, depth_forward
+            )
+
+    if meet is None:
+        return []
+    path = reconstruct_path(prev, meet)
+    current = next_[meet]
+    while current is not None:
+        path.append(current)
+        current = next_[current]
+    return path
+
+
+def _bfs_expand_level(
+    frontier: list[HT],
+    neighbors: Callable[[HT], Iterable[HT]],
+    prev: dict[HT, HT | None],
+    depth: dict[HT, int],
+    other_depth: dict[HT, int],
+) -> tuple[list[HT], HT | None]:
+    meet = None
+    best = None
+    next_frontier = []
+    for u in frontier:
+        for vertex in neighbors(u):
+            if vertex in depth:
+                continue
+            prev[vertex] = u
+            depth[vertex] = depth[u] + 1
+            next_frontier.append(vertex)
+            if vertex in other_depth:
+                # all vertices of this level have the same depth,
+                # but can be at different depth from the other side
+                total = depth[vertex] + other_depth[vertex]
+                if best is None or total < best:
+                    best = total
+                    meet = vertex
+    return next_frontier, meet
+
+
+class IndexedHeap:
+    """
+    Binary min-heap with decrease-key.
+
+    Every item is stored in the heap at most once, its position is tracked,
+    so instead of pushing a duplicate we can just lower the key of existing one.
+    """
+
+    __slots__ = ("_keys", "_items", "_positions")
+
+    def __init__(self) -> None:
+        self._keys: list[int] = []
+        self._items: list[Hashable] = []
+        self._positions: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def push(self, item: Hashable, key: int) -> bool:
+        """
+        Push new item or decrease the key of existing one.
+        Return False if item is already in heap with less or equal key.
+        """
+        pos = self._positions.get(item)
+        if pos is None:
+            pos = len(self._items)
+            self._keys.append(key)
+            self._items.append(item)
+            self._positions[item] = pos
+        elif key < self._keys[pos]:
+            self._keys[pos] = key
+        else:
+            return False
+        self._sift_up(pos)
+        return True
+
+    def pop(self) -> tuple[int, Hashable]:
+        keys, items = self._keys, self._items
+        key, item = keys[0], items[0]
+        del self._positions[item]
+        last_key, last_item = keys.pop(), items.pop()
+        if items:
+            keys[0], items[0] = last_key, last_item
+            self._positions[last_item] = 0
+            self._sift_down(0)
+        return key, item
+
+    def _sift_up(self, pos: int) -> None:
+        keys, items, positions = self._keys, self._items, self._positions
+        key, item = keys[pos], items[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if keys[parent] <= key:
+                break
+            keys[pos], items[pos] = keys[parent], items[parent]
+            positions[items[pos]] = pos
+            pos = parent
+        keys[pos], items[pos] = key, item
+        positions[item] = pos
+
+    def _sift_down(self, pos: int) -> None:
+        keys, items, positions = self._keys, self._items, self._positions
+        size = len(items)
+        key, item = keys[pos], items[pos]
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and keys[right] < keys[child]:
+                child = right
+            if key <= keys[child]:
+                break
+            keys[pos], items[pos] = keys[child], items[child]
+            positions[items[pos]] = pos
+            pos = child
+        keys[pos], items[pos] = key, item
+        positions[item] = pos
+
+
 def dijkstra(
-    graph: dict[HT, dict[HT, int]], source: HT
+    graph: dict[HT, dict[HT, int]], source: HT, *, indexed_heap: bool = False
 ) -> tuple[dict[HT, int], dict[HT, HT]]:
+    """
+    Dijkstra's algorithm.
+
+    Every vertex is expanded only once: outdated heap entries are skipped
+    when popped. With `indexed_heap=True` heap holds no duplicates at all
+    (decrease-key instead of push), it uses less memory on dense graphs,
+    but heapq is faster on CPython.
+
+    :param graph: graph in format {vertex: {neighbor: cost}}
+    :param source: source vertex
+    :param indexed_heap: use IndexedHeap instead of heapq
+    :return: tuple of distance and previous vertex
+    """
+    if indexed_heap:
+        return _dijkstra_indexed_heap(graph, source)
+
     dist = {source: 0}
     prev = {source: None}
     pq = [(0, source)]
     while pq:
-        _, u = heapq.heappop(pq)
+        cost, u = heapq.heappop(pq)
+        if cost > dist[u]:
+            continue
         for vertex, val in graph[u].items():
-            if vertex not in dist or dist[u] + val < dist[vertex]:
-                dist[vertex] = dist[u] + val
+            new_cost = cost + val
+            if vertex not in dist or new_cost < dist[vertex]:
+                dist[vertex] = new_cost
                 prev[vertex] = u
-                heapq.heappush(pq, (dist[vertex], vertex))
+                heapq.heappush(pq, (new_cost, vertex))
+    return dist, prev
+
+
+def _dijkstra_indexed_heap(
+    graph: dict[HT, dict[HT, int]], source: HT
+) -> tuple[dict[HT, int], dict[HT, HT]]:
+    dist = {source: 0}
+    prev = {source: None}
+    pq = IndexedHeap()
+    pq.push(source, 0)
+    while pq:
+        cost, u = pq.pop()
+        for vertex, val in graph[u].items():
+            new_cost = cost + val
+            if vertex not in dist or new_cost < dist[vertex]:
+                dist[vertex] = new_cost
+                prev[vertex] = u
+                pq.push(vertex, new_cost)
     return dist, prev
 
 
@@ -407,7 +1066,10 @@ def a_star(
 
     heuristic function must be admissible (never overestimate the distance to the goal).
     https://en.wikipedia.org/wiki/A*_search_algorithm#Admissibility
-    for example, Manhattan distance is admissible.
+    and consistent, because closed vertices are never expanded again.
+    https://en.wikipedia.org/wiki/Consistent_heuristic
+    for example, Manhattan distance is admissible and consistent
+    (when every step costs at least 1).
     >>> def heuristic(candidate, target):
     ...     (x1, y1) = candidate
     ...     (x2, y2) = target
@@ -421,20 +1083,386 @@ def a_star(
     """
     dist = {source: 0}
     prev = {source: None}
-    pq = [(0, source)]
+    closed = set()
+    # ties are broken by smaller heuristic (vertex closer to target)
+    # and then in FIFO order by counter, so vertices are never compared
+    counter = itertools.count()
+    pq = [(0, 0, next(counter), source)]
 
     while pq:
-        _, current = heapq.heappop(pq)
+        *_, current = heapq.heappop(pq)
+        if current in closed:
+            continue
+        closed.add(current)
 
         if current == target:
             break
 
         for vertex, val in graph[current].items():
+            if vertex in closed:
+                continue
             new_cost = dist[current] + val
             if vertex not in dist or new_cost < dist[vertex]:
                 dist[vertex] = new_cost
-                priority = new_cost + heuristic(vertex, target)
-                heapq.heappush(pq, (priority, vertex))
+                estimation = heuristic(vertex, target)
+                priority = new_cost + estimation
+                heapq.heappush(pq, (priority, estimation, next(counter), vertex))
                 prev[vertex] = current
 
     return dist, prev
+
+
+def dijkstra_implicit(
+    neighbors: Callable[[HT], Iterable[tuple[HT, int]]],
+    source: HT,
+    *,
+    is_target: Callable[[HT], bool] | None = None,
+) -> tuple[dict[HT, int], dict[HT, HT]]:
+    """
+    Dijkstra's algorithm on a graph that is never materialized.
+
+    States are expanded lazily, only when they are popped from the queue.
+    If `is_target` is passed, search stops when the first target is settled,
+    so distance of this target is minimal among all targets in result.
+
+    :param neighbors: function that returns (neighbor, cost) pairs for a state
+    :param source: source state
+    :param is_target: predicate for early exit
+    :return: tuple of distance and previous state
+    """
+    dist = {source: 0}
+    prev = {source: None}
+    pq = [(0, source)]
+    while pq:
+        cost, u = heapq.heappop(pq)
+        if cost > dist[u]:
+            # stale entry, u is already expanded with better cost
+            continue
+        if is_target is not None and is_target(u):
+            break
+        for vertex, val in neighbors(u):
+            new_cost = cost + val
+            if vertex not in dist or new_cost < dist[vertex]:
+                dist[vertex] = new_cost
+                prev[vertex] = u
+                heapq.heappush(pq, (new_cost, vertex))
+    return dist, prev
+
+
+def dial_shortest_path(
+    neighbors: Callable[[HT], Iterable[tuple[HT, int]]],
+    source: HT,
+    max_weight: int,
+    *,
+    is_target: Callable[[HT], bool] | None = None,
+) -> tuple[dict[HT, int], dict[HT, HT]]:
+    """
+    Dial's algorithm: Dijkstra with a bucket queue instead of a heap.
+
+    Works for integer weights in range 0..max_weight. Vertices with
+    distance d are stored in bucket d % (max_weight + 1), only max_weight + 1
+    buckets are in use at any time, so push and pop are O(1).
+    Returns the same (dist, prev) as `dijkstra_implicit`.
+
+    :param neighbors: function that returns (neighbor, cost) pairs for a state
+    :param source: source state
+    :param max_weight: maximum weight of an edge
+    :param is_target: predicate for early exit
+    :return: tuple of distance and previous state
+    """
+    size = max_weight + 1
+    buckets: list[list[HT]] = [[] for _ in range(size)]
+    buckets[0].append(source)
+    pending = 1
+    dist = {source: 0}
+    prev = {source: None}
+    cost = 0
+    while pending:
+        bucket = buckets[cost % size]
+        while bucket:
+            u = bucket.pop()
+            pending -= 1
+            if dist[u] != cost:
+                # stale entry, u was moved to a closer bucket
+                continue
+            if is_target is not None and is_target(u):
+                return dist, prev
+            for vertex, val in neighbors(u):
+                if not 0 <= val <= max_weight:
+                    raise ValueError(f"Weight {val} is out of range 0..{max_weight}")
+                new_cost = cost + val
+                if vertex not in dist or new_cost < dist[vertex]:
+                    dist[vertex] = new_cost
+                    prev[vertex] = u
+                    buckets[new_cost % size].append(vertex)
+                    pending += 1
+        cost += 1
+    return dist, prev
+
+
+def a_star_implicit(
+    neighbors: Callable[[HT], Iterable[tuple[HT, int]]],
+    source: HT,
+    is_target: Callable[[HT], bool],
+    heuristic: Callable[[HT], int],
+) -> tuple[dict[HT, int], dict[HT, HT]]:
+    """
+    A* algorithm on a graph that is never materialized.
+
+    Same as `a_star`, but heuristic takes only a state,
+    because there can be many targets described by `is_target`.
+
+    :param neighbors: function that returns (neighbor, cost) pairs for a state
+    :param source: source state
+    :param is_target: predicate for target states
+    :param heuristic: admissible estimation of distance from state to target
+    :return: tuple of distance and previous state
+    """
+    dist = {source: 0}
+    prev = {source: None}
+    closed = set()
+    counter = itertools.count()
+    pq = [(heuristic(source), heuristic(source), next(counter), source)]
+
+    while pq:
+        *_, current = heapq.heappop(pq)
+        if current in closed:
+            continue
+        closed.add(current)
+
+        if is_target(current):
+            break
+
+        cost = dist[current]
+        for vertex, val in neighbors(current):
+            if vertex in closed:
+                continue
+            new_cost = cost + val
+            if vertex not in dist or new_cost < dist[vertex]:
+                dist[vertex] = new_cost
+                estimation = heuristic(vertex)
+                priority = new_cost + estimation
+                heapq.heappush(pq, (priority, estimation, next(counter), vertex))
+                prev[vertex] = current
+
+    return dist, prev
+
+
+def reconstruct_path(prev: dict[HT, HT | None], target: HT) -> list[HT]:
+    """
+    Walk `prev` map returned by pathfinding functions back from target.
+
+    :return: list of vertices from source to target,
+        empty list if target wasn't reached
+    """
+    if target not in prev:
+        return []
+
+    path = []
+    current = target
+    while current is not None:
+        path.append(current)
+        current = prev[current]
+    path.reverse()
+    return path
+
+
+# ========================== cycles ==========================
+class Cycle:
+    """
+    States x0, x1 = step(x0), ... with x(mu + lam) == x(mu).
+    `keys` are keys of x0 .. x(mu + lam - 1) when they were recorded.
+    """
+
+    __slots__ = ("mu", "lam", "keys")
+
+    def __init__(self, mu: int, lam: int, keys: list[Hashable] | None = None) -> None:
+        self.mu = mu
+        self.lam = lam
+        self.keys = keys
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(mu={self.mu}, lam={self.lam})"
+
+    def index(self, n: int) -> int:
+        """Index of the first state equal to x(n), it's always < mu + lam."""
+        if n < self.mu:
+            return n
+        return self.mu + (n - self.mu) % self.lam
+
+    def nth(self, n: int) -> Hashable:
+        if self.keys is None:
+            raise ValueError("keys weren't recorded, simulate index(n) steps instead")
+        return self.keys[self.index(n)]
+
+
+def find_cycle(
+    step: Callable[[T], T],
+    state: T,
+    *,
+    key: Callable[[T], Hashable] | None = None,
+    method: str = "hash",
+) -> Cycle:
+    """
+    Find where sequence of states starting at `state` loops.
+
+    "hash" method keeps key of every state seen, so `Cycle.nth` works
+    and `step` may mutate state in place. Pass compact `key`
+    (e.g. bytes of the state) to not keep full snapshots alive.
+    "brent" method keeps only two states, `step` must return a new one.
+    """
+    if key is None:
+        key = _identity
+    if method == "hash":
+        return _find_cycle_hash(step, state, key)
+    if method == "brent":
+        return _find_cycle_brent(step, state, key)
+    raise ValueError(f"Unknown method {method!r}")
+
+
+def _identity(state: T) -> T:
+    return state
+
+
+def _find_cycle_hash(
+    step: Callable[[T], T], state: T, key: Callable[[T], Hashable]
+) -> Cycle:
+    seen: dict[Hashable, int] = {}
+    keys = []
+    while (state_key := key(state)) not in seen:
+        seen[state_key] = len(keys)
+        keys.append(state_key)
+        state = step(state)
+    mu = seen[state_key]
+    return Cycle(mu, len(keys) - mu, keys)
+
+
+def _find_cycle_brent(
+    step: Callable[[T], T], state: T, key: Callable[[T], Hashable]
+) -> Cycle:
+    # find lam: tortoise teleports to hare at every power of two
+    power = lam = 1
+    tortoise_key = key(state)
+    hare = step(state)
+    while (hare_key := key(hare)) != tortoise_key:
+        if power == lam:
+            tortoise_key = hare_key
+            power *= 2
+            lam = 0
+        hare = step(hare)
+        lam += 1
+
+    # find mu: hare starts lam steps ahead, they meet at the cycle start
+    tortoise = hare = state
+    for _ in range(lam):
+        hare = step(hare)
+    mu = 0
+    while key(tortoise) != key(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        mu += 1
+    return Cycle(mu, lam)
+
+
+# ========================== strings ==========================
+class AhoCorasick:
+    """
+    Aho-Corasick automaton for finding many keywords in one pass.
+
+    Goto table is dense (failure links are folded into it), so a step
+    is one dict lookup per char. Scans take `start`/`end` indexes,
+    so lines of a big buffer are scanned without slicing them out.
+    """
+
+    __slots__ = ("keywords", "_lengths", "_max_length", "_forward", "_backward")
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = list(keywords)
+        if not all(self.keywords):
+            raise ValueError("Keywords must not be empty")
+        self._lengths = [len(keyword) for keyword in self.keywords]
+        self._max_length = max(self._lengths, default=0)
+        self._forward = self._build(self.keywords)
+        self._backward = self._build([keyword[::-1] for keyword in self.keywords])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.keywords!r})"
+
+    @staticmethod
+    def _build(keywords: list[str]) -> tuple[list[dict[str, int]], list[list[int]]]:
+        children: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for k, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                if char not in children[state]:
+                    children[state][char] = len(children)
+                    children.append({})
+                    outputs.append([])
+                state = children[state][char]
+            outputs[state].append(k)
+
+        # BFS, so failure state of every state is finished before it
+        goto: list[dict[str, int]] = [{}] * len(children)
+        goto[0] = children[0]
+        fail = [0] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            goto[state] = {**goto[fail[state]], **children[state]}
+            for char, next_state in children[state].items():
+                fail[next_state] = goto[fail[state]].get(char, 0)
+                outputs[next_state] += outputs[fail[next_state]]
+                queue.append(next_state)
+        return goto, outputs
+
+    def iter_matches(
+        self, text: str, start: int = 0, end: int | None = None
+    ) -> Generator[tuple[int, str], None, None]:
+        """All (index, keyword) matches, overlapping ones too, by end index."""
+        goto, outputs = self._forward
+        state = 0
+        for i in range(start, len(text) if end is None else end):
+            state = goto[state].get(text[i], 0)
+            for k in outputs[state]:
+                yield i - self._lengths[k] + 1, self.keywords[k]
+
+    def first_match(
+        self, text: str, start: int = 0, end: int | None = None
+    ) -> tuple[int, str] | None:
+        """(index, keyword) of the match which starts first, shortest on ties."""
+        end = len(text) if end is None else end
+        return self._scan_first(self._forward, text, range(start, end), 1)
+
+    def last_match(
+        self, text: str, start: int = 0, end: int | None = None
+    ) -> tuple[int, str] | None:
+        """(index, keyword) of the match which ends last, shortest on ties."""
+        end = len(text) if end is None else end
+        return self._scan_first(self._backward, text, range(end - 1, start - 1, -1), -1)
+
+    def _scan_first(
+        self,
+        automaton: tuple[list[dict[str, int]], list[list[int]]],
+        text: str,
+        indexes: range,
+        direction: int,
+    ) -> tuple[int, str] | None:
+        goto, outputs = automaton
+        lengths = self._lengths
+        max_length = self._max_length
+        state = 0
+        best = None
+        best_first = 0
+        for i in indexes:
+            # matches which end here can't start before the best one anymore
+            if best is not None and (i - best_first) * direction >= max_length:
+                break
+            state = goto[state].get(text[i], 0)
+            for k in outputs[state]:
+                # first char of the match in scan order
+                first = i - direction * (lengths[k] - 1)
+                if best is None or (first - best_first) * direction < 0:
+                    best_first = first
+                    best = (min(i, first), self.keywords[k])
+        return best
@@ -0,0 +1,133 @@
+"""
+Count vertex expansions and edge relaxations of dijkstra implementations
+on day17 state graphs. Run from this directory:
+
+    python bench_dijkstra.py
+"""
+
+from __future__ import annotations
+
+import heapq
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import support as sup
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from day17 import part1, part2  # noqa: E402
+
+SOURCE = ((0, 0), "right", 1)
+# jumps graph keeps only the axis of the last move, not direction and steps
+JUMP_SOURCE = ((0, 0), "horizontal")
+
+
+class CountingGraph(dict):
+    """Graph that counts how many times vertices are expanded."""
+
+    expansions = 0
+    relaxations = 0
+
+    def __getitem__(self, vertex):
+        edges = super().__getitem__(vertex)
+        self.expansions += 1
+        self.relaxations += len(edges)
+        return edges
+
+
+def materialize(neighbors, source) -> CountingGraph:
+    graph = CountingGraph()
+    queue = deque([source])
+    graph[source] = {}
+    while queue:
+        u = queue.popleft()
+        edges = dict(neighbors(u))
+        dict.__setitem__(graph, u, edges)
+        for vertex in edges:
+            if vertex not in graph:
+                dict.__setitem__(graph, vertex, {})
+                queue.append(vertex)
+    return graph
+
+
+def dijkstra_without_stale_check(graph, source):
+    # sup.dijkstra before stale entries were skipped
+    dist = {source: 0}
+    prev = {source: None}
+    pq = [(0, source)]
+    while pq:
+        _, u = heapq.heappop(pq)
+        for vertex, val in graph[u].items():
+            if vertex not in dist or dist[u] + val < dist[vertex]:
+                dist[vertex] = dist[u] + val
+                prev[vertex] = u
+                heapq.heappush(pq, (dist[vertex], vertex))
+    return dist, prev
+
+
+def make_jump_neighbors(matrix, min_steps: int, max_steps: int):
+    """
+    Alternative day17 state graph: turn and go straight for min..max steps
+    in one edge. Edges into a state have different weights here, so
+    vertices get improved after they were pushed and stale entries appear.
+    """
+    len_m, len_n = len(matrix), len(matrix[0])
+    turns = {"vertical": ((0, 1), (0, -1)), "horizontal": ((1, 0), (-1, 0))}
+
+    def neighbors(state):
+        (m, n), axis = state
+        next_axis = "vertical" if axis == "horizontal" else "horizontal"
+        for dm, dn in turns[axis]:
+            cost = 0
+            for steps in range(1, max_steps + 1):
+                next_m, next_n = m + dm * steps, n + dn * steps
+                if not (0 <= next_m < len_m and 0 <= next_n < len_n):
+                    break
+                cost += matrix[next_m][next_n]
+                if steps >= min_steps:
+                    yield ((next_m, next_n), next_axis), cost
+
+    return neighbors
+
+
+FUNCTIONS = {
+    "without stale check": dijkstra_without_stale_check,
+    "dijkstra": sup.dijkstra,
+    "dijkstra indexed heap": lambda g, s: sup.dijkstra(g, s, indexed_heap=True),
+}
+
+
+def graphs():
+    matrix, *_ = sup.make_matrix_from_input(part1.read_input(), cast_func=int)
+    yield "part1", part1.make_neighbors(matrix), SOURCE
+    yield "part2", part2.make_neighbors(matrix), SOURCE
+    yield "part1 jumps", make_jump_neighbors(matrix, 1, 3), JUMP_SOURCE
+    yield "part2 jumps", make_jump_neighbors(matrix, 4, 10), JUMP_SOURCE
+
+
+def main() -> None:
+    for name, neighbors, source in graphs():
+        graph = materialize(neighbors, source)
+        edges = sum(len(edges) for edges in graph.values())
+        print(f"day17 {name}: {len(graph)} vertices, {edges} edges")
+
+        expected = None
+        for label, function in FUNCTIONS.items():
+            graph.expansions = graph.relaxations = 0
+            start = time.perf_counter()
+            dist, _ = function(graph, source)
+            spent = sup.humanized_seconds(time.perf_counter() - start)
+            if expected is None:
+                expected = dist
+            assert dist == expected
+            print(
+                f"  {label:<22} expansions: {graph.expansions:>9}"
+                f"  relaxations: {graph.relaxations:>9}  time: {spent}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare list-of-lists matrix from `make_matrix_from_input` with `Grid`
+on real inputs. Run from this directory:
+
+    python bench_grid.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from pathlib import Path
+
+import support as sup
+
+ROOT = Path(__file__).parent.parent.parent
+INPUTS = {
+    "day16": ROOT / "day16" / "input.txt",
+    "day21": ROOT / "day21" / "input.txt",
+}
+NUMBER_OF_RUNS = 100
+
+
+def parse_matrix(s: str):
+    return sup.make_matrix_from_input(s)[0]
+
+
+def parse_grid(s: str):
+    return sup.Grid.from_input(s)
+
+
+def sweep_matrix(matrix) -> int:
+    count = 0
+    for m in range(len(matrix)):
+        for n in range(len(matrix[0])):
+            if matrix[m][n] != ".":
+                count += 1
+    return count
+
+
+def sweep_grid(grid) -> int:
+    count = 0
+    for m in range(grid.height):
+        for n in range(grid.width):
+            if grid[m, n] != ".":
+                count += 1
+    return count
+
+
+def sweep_grid_flat(grid) -> int:
+    count = 0
+    stride = grid.stride
+    for m in range(grid.height):
+        start = m * stride
+        for i in range(start, start + grid.width):
+            if grid.at(i) != ".":
+                count += 1
+    return count
+
+
+def sweep_grid_data(grid) -> int:
+    # hot loops should work with raw bytes, it avoids Python-level __getitem__
+    count = 0
+    data = grid.data
+    dot = ord(".")
+    stride = grid.stride
+    for m in range(grid.height):
+        start = m * stride
+        for i in range(start, start + grid.width):
+            if data[i] != dot:
+                count += 1
+    return count
+
+
+def columns_matrix(matrix) -> int:
+    count = 0
+    for n in range(len(matrix[0])):
+        column = [row[n] for row in matrix]
+        count += column.count(".")
+    return count
+
+
+def columns_grid(grid) -> int:
+    count = 0
+    stride = grid.stride
+    for n in range(grid.width):
+        count += grid.data[n::stride].count(b".")
+    return count
+
+
+def bench(label: str, stmt: str, **globals_) -> None:
+    bench_time = timeit.timeit(stmt, globals=globals_, number=NUMBER_OF_RUNS)
+    one_run = sup.humanized_seconds(bench_time / NUMBER_OF_RUNS)
+    print(f"  {label:<24} {one_run}")
+
+
+def main() -> None:
+    for day, path in INPUTS.items():
+        s = path.read_text()
+        matrix = parse_matrix(s)
+        grid = parse_grid(s)
+        assert sweep_matrix(matrix) == sweep_grid(grid) == sweep_grid_data(grid)
+        assert sweep_grid_flat(grid) == sweep_grid(grid)
+        assert columns_matrix(matrix) == columns_grid(grid)
+
+        print(f"{day} ({grid.width}x{grid.height}), average of {NUMBER_OF_RUNS} runs")
+        bench("parse matrix", "parse_matrix(s)", parse_matrix=parse_matrix, s=s)
+        bench("parse grid", "parse_grid(s)", parse_grid=parse_grid, s=s)
+        bench("sweep matrix[m][n]", "f(x)", f=sweep_matrix, x=matrix)
+        bench("sweep grid[m, n]", "f(x)", f=sweep_grid, x=grid)
+        bench("sweep grid.at(i)", "f(x)", f=sweep_grid_flat, x=grid)
+        bench("sweep grid.data[i]", "f(x)", f=sweep_grid_data, x=grid)
+        bench("columns matrix", "f(x)", f=columns_matrix, x=matrix)
+        bench("columns grid", "f(x)", f=columns_grid, x=grid)
+
+
+if __name__ == "__main__":
+    main()
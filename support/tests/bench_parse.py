@@ -0,0 +1,66 @@
+"""
+Compare split-based parsing with `ints` on real inputs.
+Run from this directory:
+
+    python bench_parse.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from pathlib import Path
+
+import support as sup
+
+ROOT = Path(__file__).parent.parent.parent
+NUMBER_OF_RUNS = 200
+
+
+def day09_split(s: str):
+    # all numbers of the input, day09 splits the same way line by line
+    return [int(x) for x in s.split()]
+
+
+def day09_ints(s: str):
+    return sup.ints(s, signed=True)
+
+
+def day22_split(s: str):
+    # parse_bricks before it used ints
+    return [
+        tuple(map(int, line.replace("~", ",").split(","))) for line in s.splitlines()
+    ]
+
+
+def day22_ints(s: str):
+    numbers = iter(sup.ints(s))
+    return list(zip(numbers, numbers, numbers, numbers, numbers, numbers))
+
+
+CASES = {
+    "day09": (day09_split, day09_ints),
+    "day22": (day22_split, day22_ints),
+}
+
+
+def main() -> None:
+    for day, functions in CASES.items():
+        s = (ROOT / day / "input.txt").read_text()
+        megabytes = len(s) / 1024 / 1024
+        results = [function(s) for function in functions]
+        assert all(result == results[0] for result in results)
+
+        print(f"{day} ({len(s) // 1024} KB), average of {NUMBER_OF_RUNS} runs")
+        for function in functions:
+            bench_time = timeit.timeit(
+                "f(s)", globals={"f": function, "s": s}, number=NUMBER_OF_RUNS
+            )
+            one_run = bench_time / NUMBER_OF_RUNS
+            print(
+                f"  {function.__name__:<14} {sup.humanized_seconds(one_run):>8}"
+                f"  {megabytes / one_run:6.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
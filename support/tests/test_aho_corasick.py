@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from support import AhoCorasick
+
+
+def naive_matches(keywords: list[str], text: str) -> list[tuple[int, str]]:
+    return sorted(
+        (i, keyword)
+        for keyword in keywords
+        for i in range(len(text))
+        if text.startswith(keyword, i)
+    )
+
+
+@pytest.fixture()
+def automaton():
+    return AhoCorasick(["he", "she", "his", "hers"])
+
+
+def test_iter_matches(automaton) -> None:
+    result = list(automaton.iter_matches("ushers"))
+
+    assert result == [(1, "she"), (2, "he"), (2, "hers")]
+
+
+@pytest.mark.parametrize(
+    "text,first,last",
+    [
+        ("ushers", (1, "she"), (2, "hers")),
+        ("ahishe", (1, "his"), (4, "he")),
+        ("ahersh", (1, "he"), (1, "hers")),
+        ("xyz", None, None),
+        ("", None, None),
+    ],
+)
+def test_first_and_last_match(automaton, text, first, last) -> None:
+    assert automaton.first_match(text) == first
+    assert automaton.last_match(text) == last
+
+
+def test_match_inside_bounds(automaton) -> None:
+    text = "he|xx|his"
+
+    assert automaton.first_match(text, 2, 6) is None
+    assert automaton.first_match(text, 3) == (6, "his")
+    assert automaton.last_match(text, 0, 5) == (0, "he")
+
+
+def test_empty_keyword() -> None:
+    with pytest.raises(ValueError, match="empty"):
+        AhoCorasick(["a", ""])
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_naive_search(seed) -> None:
+    rng = random.Random(seed)
+    keywords = list({"".join(rng.choices("ab", k=rng.randint(1, 4))) for _ in range(5)})
+    text = "".join(rng.choices("abc", k=30))
+    automaton = AhoCorasick(keywords)
+    expected = naive_matches(keywords, text)
+
+    assert sorted(automaton.iter_matches(text)) == expected
+    assert automaton.first_match(text) == min(expected, default=None)
+    # ends last, the shortest one of those
+    last = max(expected, key=lambda m: (m[0] + len(m[1]), -len(m[1])), default=None)
+    assert automaton.last_match(text) == last
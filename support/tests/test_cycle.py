@@ -0,0 +1,74 @@
+import pytest
+
+from support import Cycle, find_cycle
+
+
+def step(x: int) -> int:
+    # 0 -> 1 -> 2 -> 3 -> 4 -> 5 -> 6 -> 7 -> 3
+    return x + 1 if x < 7 else 3
+
+
+@pytest.mark.parametrize("method", ["hash", "brent"])
+def test_find_cycle(method) -> None:
+    cycle = find_cycle(step, 0, method=method)
+
+    assert (cycle.mu, cycle.lam) == (3, 5)
+
+
+@pytest.mark.parametrize("method", ["hash", "brent"])
+@pytest.mark.parametrize("start,expected", [(3, (0, 5)), (7, (0, 5)), (5, (0, 5))])
+def test_find_cycle_starting_in_loop(method, start, expected) -> None:
+    cycle = find_cycle(step, start, method=method)
+
+    assert (cycle.mu, cycle.lam) == expected
+
+
+@pytest.mark.parametrize("method", ["hash", "brent"])
+def test_find_cycle_fixed_point(method) -> None:
+    cycle = find_cycle(lambda x: min(x + 1, 2), 0, method=method)
+
+    assert (cycle.mu, cycle.lam) == (2, 1)
+
+
+@pytest.mark.parametrize("n", [0, 2, 3, 7, 8, 100, 10**12])
+def test_nth_matches_simulation(n) -> None:
+    cycle = find_cycle(step, 0)
+
+    x = 0
+    for _ in range(cycle.index(n)):
+        x = step(x)
+    assert cycle.nth(n) == x
+    assert cycle.index(n) < cycle.mu + cycle.lam
+    if n < 200:
+        y = 0
+        for _ in range(n):
+            y = step(y)
+        assert x == y
+
+
+def test_find_cycle_with_key_and_mutable_state() -> None:
+    def rotate(state: list[int]) -> list[int]:
+        state.append(state.pop(0))
+        return state
+
+    cycle = find_cycle(rotate, [1, 2, 3, 4], key=tuple)
+
+    assert (cycle.mu, cycle.lam) == (0, 4)
+    assert cycle.nth(6) == (3, 4, 1, 2)
+
+
+def test_nth_without_keys() -> None:
+    cycle = find_cycle(step, 0, method="brent")
+
+    assert cycle.index(10) == 5
+    with pytest.raises(ValueError, match="weren't recorded"):
+        cycle.nth(10)
+
+
+def test_unknown_method() -> None:
+    with pytest.raises(ValueError, match="Unknown method"):
+        find_cycle(step, 0, method="floyd")
+
+
+def test_cycle_repr() -> None:
+    assert repr(Cycle(3, 5)) == "Cycle(mu=3, lam=5)"
@@ -0,0 +1,122 @@
+import pytest
+
+from support import Grid, max_bounds_closure, neighbors_cross
+
+
+@pytest.mark.parametrize(
+    "input_s",
+    [
+        ".#.\n###",
+        "\n.#.\n###",
+        ".#.\n###\n",
+        "\n.#.\n###\n",
+        "\n\n.#.\n###\n\n",
+    ],
+)
+def test_make_string_grid_from_input(input_s) -> None:
+    grid = Grid.from_input(input_s)
+
+    assert [list(row) for row in grid] == [[".", "#", "."], ["#", "#", "#"]]
+    assert grid.height == 2
+    assert grid.width == 3
+
+
+def test_make_int_grid_from_input() -> None:
+    grid = Grid.from_input("123\n456\n789", cast_func=int)
+
+    assert [list(row) for row in grid] == [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+
+def test_make_grid_from_input_with_different_line_lengths() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        Grid.from_input(".#.\n##\n")
+
+
+@pytest.fixture()
+def grid():
+    return Grid.from_input("123\n456\n789\n012", cast_func=int)
+
+
+@pytest.mark.parametrize(
+    "coords,expected",
+    [
+        ((0, 0), 1),
+        ((0, 2), 3),
+        ((1, 1), 5),
+        ((3, 0), 0),
+        ((3, 2), 2),
+    ],
+)
+def test_access_by_coords(grid, coords, expected) -> None:
+    m, n = coords
+
+    assert grid[m, n] == expected
+    assert grid[m][n] == expected
+    assert grid.at(grid.index(m, n)) == expected
+    assert grid.coords(grid.index(m, n)) == coords
+
+
+def test_set_by_coords(grid) -> None:
+    grid[2, 1] = 0
+
+    assert list(grid[2]) == [7, 0, 9]
+
+
+def test_row_and_column_are_views(grid) -> None:
+    row = grid.row(1)
+    column = grid.column(-1)
+
+    grid[1, 2] = 0
+    column[0] = 9
+
+    assert list(row) == [4, 5, 0]
+    assert list(column) == [9, 0, 9, 2]
+    assert grid[0, 2] == 9
+
+
+def test_find(grid) -> None:
+    assert grid.find(5) == (1, 1)
+    assert Grid.from_input("...\n..S").find("S") == (1, 2)
+    assert Grid.from_input("...\n...").find("S") is None
+
+
+def test_copy_doesnt_share_data(grid) -> None:
+    copy = grid.copy()
+    copy[0, 0] = 0
+
+    assert grid[0, 0] == 1
+    assert str(copy) == "023\n456\n789\n012"
+
+
+def test_max_bounds_closure_with_grid(grid) -> None:
+    neighbors_cross_func = max_bounds_closure(neighbors_cross, grid)
+
+    result = neighbors_cross_func(3, 2)
+
+    assert grid.max_bounds == (3, 2)
+    assert list(result) == [(3, 1), (2, 2)]
+
+
+def test_make_int_grid_from_input_with_not_digits() -> None:
+    with pytest.raises(ValueError, match="Not a digit cell 'a'"):
+        Grid.from_input("12a\n456", cast_func=int)
+
+
+def test_access_by_negative_coords() -> None:
+    grid = Grid.from_input("abc\ndef")
+
+    assert grid[1, -1] == grid[1][-1] == "f"
+    assert grid[-2, -3] == "a"
+    grid[-1, -1] = "x"
+    assert str(grid) == "abc\ndex"
+
+
+@pytest.mark.parametrize("coords", [(0, 3), (2, 0), (-3, 0), (0, -4)])
+def test_access_by_coords_out_of_range(coords) -> None:
+    grid = Grid.from_input("abc\ndef")
+
+    with pytest.raises(IndexError):
+        grid[coords]
+    with pytest.raises(IndexError):
+        grid[coords] = "x"
+    assert str(grid) == "abc\ndef"
@@ -0,0 +1,40 @@
+import pytest
+
+from support import IndexedHeap
+
+
+@pytest.fixture()
+def heap():
+    heap = IndexedHeap()
+    for item, key in [("a", 5), ("b", 3), ("c", 8), ("d", 1), ("e", 4)]:
+        heap.push(item, key)
+    return heap
+
+
+def test_pop_in_key_order(heap):
+    result = [heap.pop() for _ in range(len(heap))]
+
+    assert result == [(1, "d"), (3, "b"), (4, "e"), (5, "a"), (8, "c")]
+    assert not heap
+
+
+def test_decrease_key_doesnt_duplicate_item(heap):
+    assert heap.push("c", 2) is True
+
+    assert len(heap) == 5
+    assert heap.pop() == (1, "d")
+    assert heap.pop() == (2, "c")
+
+
+def test_push_with_bigger_key_is_ignored(heap):
+    assert heap.push("d", 10) is False
+
+    assert len(heap) == 5
+    assert heap.pop() == (1, "d")
+
+
+def test_contains(heap):
+    heap.pop()
+
+    assert "d" not in heap
+    assert "a" in heap
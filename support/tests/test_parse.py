@@ -0,0 +1,27 @@
+import pytest
+
+from support import ints
+
+
+@pytest.mark.parametrize(
+    "s,expected",
+    [
+        ("Game 12: 3 blue, 4 red", [12, 3, 4]),
+        ("1,0,1~1,2,1\n2,0,5~2,2,5\n", [1, 0, 1, 1, 2, 1, 2, 0, 5, 2, 2, 5]),
+        ("seed-to-soil map:\n50 98 2", [50, 98, 2]),
+        ("0 3 -6", [0, 3, 6]),
+        ("", []),
+    ],
+)
+def test_ints(s, expected) -> None:
+    assert ints(s) == expected
+
+
+def test_signed_ints() -> None:
+    assert ints("0 3 -6 9 -12\n-1", signed=True) == [0, 3, -6, 9, -12, -1]
+
+
+@pytest.mark.parametrize("s", ["seed-to-soil", "1-2"])
+def test_signed_ints_with_dash_not_a_sign(s) -> None:
+    with pytest.raises(ValueError):
+        ints(s, signed=True)
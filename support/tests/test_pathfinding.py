@@ -29,6 +29,7 @@ def graph(matrix):
     "function",
     [
         sup.dijkstra,
+        partial(sup.dijkstra, indexed_heap=True),
         partial(sup.a_star, target=(2, 2), heuristic=lambda a, b: 0),
     ],
 )
@@ -61,6 +62,96 @@ def test_pathfinding_functions_with_weights(graph, function) -> None:
     }
 
 
+@pytest.fixture()
+def neighbors(graph):
+    return lambda vertex: graph[vertex].items()
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        sup.dijkstra_implicit,
+        partial(
+            sup.a_star_implicit,
+            is_target=lambda vertex: vertex == (2, 2),
+            heuristic=lambda vertex: 0,
+        ),
+    ],
+)
+def test_implicit_pathfinding_functions_with_weights(neighbors, function) -> None:
+    source = (0, 0)
+
+    result_dist, result_prev = function(neighbors, source)
+
+    assert result_dist == {
+        (0, 0): 0,
+        (0, 1): 2,
+        (0, 2): 5,
+        (1, 0): 4,
+        (1, 1): 7,
+        (1, 2): 11,
+        (2, 0): 11,
+        (2, 1): 15,
+        (2, 2): 20,
+    }
+    assert result_prev[(2, 2)] == (1, 2)
+    assert result_prev[(1, 2)] == (0, 2)
+
+
+def test_dial_shortest_path(graph, neighbors) -> None:
+    expected_dist, _ = sup.dijkstra(graph, (0, 0))
+
+    result_dist, result_prev = sup.dial_shortest_path(neighbors, (0, 0), 9)
+
+    assert result_dist == expected_dist
+    for vertex, prev_vertex in result_prev.items():
+        if prev_vertex is not None:
+            weight = graph[prev_vertex][vertex]
+            assert result_dist[prev_vertex] + weight == result_dist[vertex]
+
+
+def test_dial_shortest_path_with_zero_weights() -> None:
+    graph = {"a": {"b": 0, "c": 2}, "b": {"c": 0}, "c": {"a": 1}}
+
+    result_dist, result_prev = sup.dial_shortest_path(
+        lambda vertex: graph[vertex].items(), "a", 2
+    )
+
+    assert result_dist == {"a": 0, "b": 0, "c": 0}
+    assert result_prev == {"a": None, "b": "a", "c": "b"}
+
+
+def test_dial_shortest_path_with_too_big_weight(neighbors) -> None:
+    with pytest.raises(ValueError, match="out of range"):
+        sup.dial_shortest_path(neighbors, (0, 0), 5)
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        partial(sup.dial_shortest_path, max_weight=9, is_target=lambda v: v == (1, 1)),
+        partial(sup.dijkstra_implicit, is_target=lambda vertex: vertex == (1, 1)),
+        partial(
+            sup.a_star_implicit,
+            is_target=lambda vertex: vertex == (1, 1),
+            heuristic=lambda vertex: abs(vertex[0] - 1) + abs(vertex[1] - 1),
+        ),
+    ],
+)
+def test_implicit_pathfinding_functions_stop_on_target(graph, function) -> None:
+    expanded = []
+
+    def neighbors(vertex):
+        expanded.append(vertex)
+        return graph[vertex].items()
+
+    result_dist, _ = function(neighbors, (0, 0))
+
+    assert result_dist[(1, 1)] == 7
+    assert (1, 1) not in expanded
+    assert len(expanded) < len(graph)
+
+
 @pytest.mark.parametrize(
     "function",
     [
@@ -83,3 +174,164 @@ def test_pathfinding_functions_wo_weights(graph, function) -> None:
         (2, 1): (2, 0),
         (2, 2): (2, 1),
     }
+
+
+class CountingGraph(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.expanded = []
+
+    def __getitem__(self, vertex):
+        self.expanded.append(vertex)
+        return super().__getitem__(vertex)
+
+
+def manhattan(vertex, target):
+    return abs(vertex[0] - target[0]) + abs(vertex[1] - target[1])
+
+
+def make_uniform_graph(size):
+    matrix = [[1] * size for _ in range(size)]
+    neighbors_cross = sup.max_bounds_closure(sup.neighbors_cross, matrix)
+    return {
+        (m, n): {neighbor: 1 for neighbor in neighbors_cross(m, n)}
+        for m in range(size)
+        for n in range(size)
+    }
+
+
+@pytest.mark.parametrize(
+    "heuristic,expected_expansions",
+    [
+        (lambda vertex, target: 0, 8),
+        (manhattan, 8),
+    ],
+)
+def test_a_star_node_expansions(graph, heuristic, expected_expansions) -> None:
+    counting_graph = CountingGraph(graph)
+
+    result_dist, _ = sup.a_star(counting_graph, (0, 0), (2, 2), heuristic)
+
+    assert result_dist[(2, 2)] == 20
+    assert len(counting_graph.expanded) == expected_expansions
+    assert len(set(counting_graph.expanded)) == expected_expansions
+
+
+def test_a_star_node_expansions_with_ties() -> None:
+    counting_graph = CountingGraph(make_uniform_graph(10))
+
+    result_dist, result_prev = sup.a_star(counting_graph, (0, 0), (9, 9), manhattan)
+
+    assert result_dist[(9, 9)] == 18
+    # only vertices along one shortest path are expanded
+    assert len(counting_graph.expanded) == 18
+    assert sup.reconstruct_path(result_prev, (9, 9))[:-1] == counting_graph.expanded
+
+
+def test_a_star_doesnt_compare_vertices() -> None:
+    source, middle1, middle2, target = (object() for _ in range(4))
+    graph = {
+        source: {middle1: 1, middle2: 1},
+        middle1: {target: 1},
+        middle2: {target: 1},
+        target: {},
+    }
+
+    result_dist, result_prev = sup.a_star(graph, source, target, lambda a, b: 0)
+
+    assert result_dist[target] == 2
+    assert sup.reconstruct_path(result_prev, target) == [source, middle1, target]
+
+
+def test_a_star_implicit_node_expansions() -> None:
+    graph = CountingGraph(make_uniform_graph(10))
+
+    result_dist, _ = sup.a_star_implicit(
+        lambda vertex: graph[vertex].items(),
+        (0, 0),
+        is_target=lambda vertex: vertex == (9, 9),
+        heuristic=lambda vertex: manhattan(vertex, (9, 9)),
+    )
+
+    assert result_dist[(9, 9)] == 18
+    assert len(graph.expanded) == 18
+
+
+@pytest.mark.parametrize(
+    "target,expected",
+    [
+        ((2, 2), [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)]),
+        ((1, 1), [(0, 0), (0, 1), (1, 1)]),
+        ((0, 0), [(0, 0)]),
+        ((5, 5), []),
+    ],
+)
+def test_reconstruct_path(graph, target, expected) -> None:
+    _, prev = sup.dijkstra(graph, (0, 0))
+
+    result = sup.reconstruct_path(prev, target)
+
+    assert result == expected
+
+
+def test_bfs_levels(graph) -> None:
+    result = list(sup.bfs_levels(graph.__getitem__, (0, 0)))
+
+    assert [sorted(frontier) for frontier in result] == [
+        [(0, 0)],
+        [(0, 1), (1, 0)],
+        [(0, 2), (1, 1), (2, 0)],
+        [(1, 2), (2, 1)],
+        [(2, 2)],
+    ]
+
+
+def test_bfs_level_sizes(graph) -> None:
+    result = sup.bfs_level_sizes(graph.__getitem__, (1, 1))
+
+    assert list(result) == [1, 4, 4]
+
+
+@pytest.mark.parametrize(
+    "source,target,expected_len",
+    [
+        ((0, 0), (0, 0), 1),
+        ((0, 0), (0, 1), 2),
+        ((0, 0), (9, 9), 19),
+        ((3, 7), (8, 1), 12),
+    ],
+)
+def test_bfs_bidirectional(source, target, expected_len) -> None:
+    graph = make_uniform_graph(10)
+
+    result = sup.bfs_bidirectional(graph.__getitem__, source, target)
+
+    assert len(result) == expected_len
+    assert result[0] == source
+    assert result[-1] == target
+    for u, vertex in zip(result, result[1:]):
+        assert vertex in graph[u]
+
+
+def test_bfs_bidirectional_directed_graph() -> None:
+    graph = {"a": ["b", "c"], "b": ["d"], "c": ["e"], "d": ["f"], "e": [], "f": []}
+    reverse_graph = {}
+    for u, vertices in graph.items():
+        for vertex in vertices:
+            reverse_graph.setdefault(vertex, []).append(u)
+
+    result = sup.bfs_bidirectional(
+        graph.__getitem__,
+        "a",
+        "f",
+        reverse_neighbors=lambda vertex: reverse_graph.get(vertex, []),
+    )
+    unreachable = sup.bfs_bidirectional(
+        graph.__getitem__,
+        "e",
+        "f",
+        reverse_neighbors=lambda vertex: reverse_graph.get(vertex, []),
+    )
+
+    assert result == ["a", "b", "d", "f"]
+    assert unreachable == []
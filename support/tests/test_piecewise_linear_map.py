@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from support import PiecewiseLinearMap, Range, RangeSet
+
+
+def random_table(rng: random.Random) -> list[tuple[Range, int]]:
+    sources = RangeSet.from_pairs(
+        (start, start + rng.randint(1, 15))
+        for start in (rng.randint(-20, 60) for _ in range(rng.randint(0, 5)))
+    )
+    return [(source, rng.randint(-20, 20)) for source in sources]
+
+
+def map_one(mapping_table: list[tuple[Range, int]], n: int) -> int:
+    for source, offset in mapping_table:
+        if n in source:
+            return n + offset
+    return n
+
+
+@pytest.fixture()
+def seed_to_soil():
+    # from 2023 day05 example
+    return PiecewiseLinearMap([(Range(98, 100), -48), (Range(50, 98), 2)])
+
+
+@pytest.mark.parametrize(
+    "n,expected", [(0, 0), (49, 49), (50, 52), (79, 81), (98, 50), (99, 51), (100, 100)]
+)
+def test_call(seed_to_soil, n, expected) -> None:
+    assert seed_to_soil(n) == expected
+
+
+def test_table_merges_pieces(seed_to_soil) -> None:
+    table = [(Range(0, 5), 3), (Range(5, 10), 3), (Range(10, 12), 0)]
+
+    assert list(PiecewiseLinearMap(table).table()) == [(Range(0, 10), 3)]
+    assert list(seed_to_soil.table()) == [(Range(50, 98), 2), (Range(98, 100), -48)]
+
+
+def test_overlapping_pieces() -> None:
+    with pytest.raises(ValueError, match="overlaps"):
+        PiecewiseLinearMap([(Range(0, 5), 1), (Range(4, 8), 2)])
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_compose_matches_sequential_maps(seed) -> None:
+    rng = random.Random(seed)
+    tables = [random_table(rng) for _ in range(3)]
+    maps = [PiecewiseLinearMap(table) for table in tables]
+
+    composed = maps[0].compose(maps[1]).compose(maps[2])
+
+    for n in range(-50, 100):
+        expected = n
+        for table in tables:
+            expected = map_one(table, expected)
+        assert composed(n) == expected
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_map_ranges_matches_apply_mapping(seed) -> None:
+    rng = random.Random(seed)
+    table = random_table(rng)
+    range_set = RangeSet.from_pairs(
+        (start, start + rng.randint(1, 15))
+        for start in (rng.randint(-20, 60) for _ in range(rng.randint(0, 5)))
+    )
+
+    result = PiecewiseLinearMap(table).map_ranges(range_set)
+
+    assert result == range_set.apply_mapping(table)
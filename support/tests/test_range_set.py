@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from support import Range, RangeSet
+
+
+def to_set(range_set: RangeSet) -> set[int]:
+    return {n for r in range_set for n in range(r.start, r.end)}
+
+
+def random_range_set(rng: random.Random) -> RangeSet:
+    pairs = []
+    for _ in range(rng.randint(0, 6)):
+        start = rng.randint(-20, 40)
+        pairs.append((start, start + rng.randint(1, 10)))
+    return RangeSet.from_pairs(pairs)
+
+
+def test_overlapping_and_touching_ranges_are_merged() -> None:
+    range_set = RangeSet([Range(5, 8), Range(0, 2), Range(1, 3), Range(3, 4)])
+
+    assert list(range_set) == [Range(0, 4), Range(5, 8)]
+    assert len(range_set) == 2
+    assert range_set.total() == 7
+    assert repr(range_set) == "RangeSet([(0, 4), (5, 8)])"
+
+
+@pytest.mark.parametrize(
+    "n,expected",
+    [(-1, False), (0, True), (3, True), (4, False), (5, True), (7, True), (8, False)],
+)
+def test_contains(n, expected) -> None:
+    assert (n in RangeSet([Range(0, 4), Range(5, 8)])) is expected
+
+
+def test_empty() -> None:
+    assert list(RangeSet()) == []
+    assert 0 not in RangeSet()
+    assert RangeSet() | RangeSet() == RangeSet()
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_set_operations_match_python_sets(seed) -> None:
+    rng = random.Random(seed)
+    a, b = random_range_set(rng), random_range_set(rng)
+
+    assert to_set(a | b) == to_set(a) | to_set(b)
+    assert to_set(a & b) == to_set(a) & to_set(b)
+    assert to_set(a - b) == to_set(a) - to_set(b)
+    assert a | b == RangeSet.from_pairs((n, n + 1) for n in to_set(a) | to_set(b))
+
+
+def test_apply_mapping() -> None:
+    range_set = RangeSet([Range(79, 93), Range(55, 68)])
+    # seed-to-soil map from 2023 day05 example
+    mapping_table = [(Range(98, 100), -48), (Range(50, 98), 2)]
+
+    result = range_set.apply_mapping(mapping_table)
+
+    assert list(result) == [Range(57, 70), Range(81, 95)]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_apply_mapping_matches_pointwise(seed) -> None:
+    rng = random.Random(seed)
+    range_set = random_range_set(rng)
+    sources = random_range_set(rng)
+    mapping_table = [(source, rng.randint(-30, 30)) for source in sources]
+
+    def map_one(n: int) -> int:
+        for source, offset in mapping_table:
+            if n in source:
+                return n + offset
+        return n
+
+    result = range_set.apply_mapping(mapping_table)
+
+    assert to_set(result) == {map_one(n) for n in to_set(range_set)}